@@ -4,95 +4,442 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from typing import List, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import time
+
+import numpy as np
+
 from utils.tsp_parser import TSPInstance
 from utils.evaluator import calculate_tour_cost
+from utils.candidates import knn_candidates
+from algorithms.proposedalgorithm import farthest_insertion_tour, nearest_neighbor_tour, two_opt_candidates
+
+# 벡터화 DP 표의 기본 메모리 예산: float64 값 + int8 부모로 23개 도시, int32/float32 값으로 24개 도시
+HELD_KARP_MEMORY_BUDGET = 1 << 30
+# int32 값 표에서 아직 도달하지 않은 상태 (거리 하나를 더해도 넘치지 않는 값)
+INT32_UNREACHED = 1 << 30
+# 한 번에 계산하는 mask 수 (임시 (chunk, n-1) 배열 크기 제한)
+VECTORIZED_CHUNK_MASKS = 1 << 15
+# 가지치기 하한을 한 번에 계산하는 상태 수 (임시 (chunk, 남은 도시 수) 배열 크기 제한)
+PRUNING_CHUNK_STATES = 1 << 16
 
-def held_karp_simple(tsp_data: TSPInstance) -> Tuple[List[int], float]:
+def held_karp_simple(tsp_data: TSPInstance, limit: int = 20) -> Tuple[List[int], float]:
     n = tsp_data.dimension
-    dist = tsp_data.distance_matrix
     
-    if n > 20:
-        return [], float('inf')
+    check_city_limit(n, limit)
+    if n < 2:
+        return list(range(n)), 0.0
+    
+    oracle = tsp_data.oracle
+    dist = [oracle.row(i).tolist() for i in range(n)]
     
-    dp = {}
-    parent = {}
-    
-    for i in range(1, n):
-        mask = (1 << 0) | (1 << i)
-        dp[(mask, i)] = dist[0][i]
-        parent[(mask, i)] = 0
-    
-    for subset_size in range(3, n + 1):
-        for mask in range(1 << n):
-            bits_count = 0
-            temp = mask
-            while temp > 0:
-                if temp & 1:
-                    bits_count += 1
-                temp >>= 1
+    # 도시 0은 항상 출발점이므로 mask는 도시 1..n-1만 표현 (비트 k = 도시 k+1)
+    # dp[mask * m + k]: 0에서 출발해 mask를 모두 방문하고 도시 k+1에서 끝나는 최소 비용
+    m = n - 1
+    full_mask = (1 << m) - 1
+    dp = array('d', [float('inf')]) * ((full_mask + 1) * m)
+    parent = array('b', [-1]) * ((full_mask + 1) * m)
+    
+    # 도착 도시별 거리 열: incoming[k][j] = dist[j+1][k+1]
+    incoming = [[dist[j + 1][k + 1] for j in range(m)] for k in range(m)]
+    for k in range(m):
+        dp[(1 << k) * m + k] = dist[0][k + 1]
+        parent[(1 << k) * m + k] = 0
+    
+    # mask보다 작은 부분집합은 항상 먼저 계산되므로 증가 순서 한 번이면 충분
+    for mask in range(1, full_mask + 1):
+        if mask & (mask - 1) == 0:
+            continue
+        base = mask * m
+        remaining = mask
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            last = low.bit_length() - 1
+            prev_mask = mask ^ low
+            prev_base = prev_mask * m
+            column = incoming[last]
+            
+            min_cost = float('inf')
+            best_prev = -1
+            bits = prev_mask
+            while bits:
+                prev_low = bits & -bits
+                bits ^= prev_low
+                prev = prev_low.bit_length() - 1
+                cost = dp[prev_base + prev] + column[prev]
+                if cost < min_cost:
+                    min_cost = cost
+                    best_prev = prev
             
-            if bits_count != subset_size:
-                continue
-            if not (mask & 1):
-                continue
-                
-            for last in range(1, n):
-                if not (mask & (1 << last)):
-                    continue
-                
-                prev_mask = mask ^ (1 << last)
-                min_cost = float('inf')
-                best_prev = -1
-                
-                for prev in range(n):
-                    if prev == last or not (prev_mask & (1 << prev)):
-                        continue
-                    if (prev_mask, prev) in dp:
-                        cost = dp[(prev_mask, prev)] + dist[prev][last]
-                        if cost < min_cost:
-                            min_cost = cost
-                            best_prev = prev
-                
-                if best_prev != -1:
-                    dp[(mask, last)] = min_cost
-                    parent[(mask, last)] = best_prev
-    
-    final_mask = (1 << n) - 1
+            dp[base + last] = min_cost
+            parent[base + last] = best_prev + 1
+    
+    last_city = closing_city([dp[full_mask * m + k] for k in range(m)], dist)
+    if last_city == -1:
+        return [], float('inf')
+    
+    path = reconstruct_path(parent, m, last_city)
+    final_cost = calculate_tour_cost(path, dist)
+    return path, final_cost
+
+def check_city_limit(n: int, limit: int):
+    if limit is not None and n > limit:
+        raise ValueError(f"Held-Karp limit is {limit} cities, instance has {n} (pass a larger limit to override)")
+
+def closing_city(final_costs, dist) -> int:
+    # 모든 도시를 방문한 뒤 0으로 돌아오는 비용이 가장 작은 마지막 도시 (동률이면 작은 번호)
     min_cost = float('inf')
     last_city = -1
+    for k in range(len(final_costs)):
+        total = final_costs[k] + dist[k + 1][0]
+        if total < min_cost:
+            min_cost = total
+            last_city = k + 1
+    return last_city
+
+def reconstruct_path(parent, m: int, last_city: int) -> List[int]:
+    # parent[mask * m + k]: mask 상태에서 도시 k+1 직전 도시
+    path = []
+    mask = (1 << m) - 1
+    curr = last_city
+    while curr != 0:
+        path.append(curr)
+        next_curr = int(parent[mask * m + curr - 1])
+        mask ^= 1 << (curr - 1)
+        curr = next_curr
+    path.append(0)
+    path.reverse()
+    return path
+
+def subset_layers(m: int) -> List[np.ndarray]:
+    # 원소 수별 mask 목록 (popcount: 비트 하나를 추가할 때마다 앞 절반 + 1)
+    popcount = np.zeros(1, dtype=np.int8)
+    for _ in range(m):
+        popcount = np.concatenate([popcount, popcount + 1])
+    order = np.argsort(popcount, kind='stable')
+    boundaries = np.searchsorted(popcount[order], np.arange(m + 2))
+    return [order[boundaries[size]:boundaries[size + 1]] for size in range(m + 1)]
+
+def held_karp_layout(n: int, dist: np.ndarray, memory_budget: int, cost_only: bool = False) -> Tuple[np.dtype, bool]:
+    # 예산 안에 들어가는 (값 dtype, 부모 표 저장 여부) 중 가장 정확하고 빠른 조합
+    # 정수 거리이고 합이 int32 범위면 int32(정확), 아니면 float32(근사)로 줄임
+    entries = (1 << (n - 1)) * (n - 1)
+    integral = bool(np.all(dist == np.round(dist)))
+    compact = np.dtype(np.int32) if integral and n * float(dist.max()) < INT32_UNREACHED else np.dtype(np.float32)
+    layouts = [(np.dtype(np.float64), True), (np.dtype(np.float64), False), (compact, True), (compact, False)]
+    for value_dtype, store_parents in layouts:
+        if store_parents and cost_only:
+            continue
+        if entries * (value_dtype.itemsize + store_parents) <= memory_budget:
+            return value_dtype, store_parents
+    raise MemoryError(f"Held-Karp table for {n} cities needs at least {entries * compact.itemsize} bytes "
+                      f"(budget {memory_budget})")
+
+def held_karp_vectorized(tsp_data: TSPInstance, memory_budget: int = HELD_KARP_MEMORY_BUDGET,
+                         cost_only: bool = False) -> Tuple[List[int], float]:
+    n = tsp_data.dimension
+    
+    if n < 2:
+        return list(range(n)), 0.0
+    
+    dist = np.asarray(tsp_data.oracle.rows(0, n), dtype=np.float64)
+    value_dtype, store_parents = held_karp_layout(n, dist, memory_budget, cost_only)
+    unreached = INT32_UNREACHED if value_dtype == np.int32 else np.inf
+    values = dist.astype(value_dtype)
     
-    for i in range(1, n):
-        if (final_mask, i) in dp:
-            total = dp[(final_mask, i)] + dist[i][0]
-            if total < min_cost:
-                min_cost = total
-                last_city = i
+    m = n - 1
+    full_mask = (1 << m) - 1
+    dp = np.full((full_mask + 1, m), unreached, dtype=value_dtype)
+    parent = np.full((full_mask + 1, m), -1, dtype=np.int8) if store_parents else None
     
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = values[0, 1:]
+    if store_parents:
+        parent[singles, np.arange(m)] = 0
+    
+    # 같은 원소 수의 mask들은 서로 독립: 마지막 도시별로 한 번에 min(dp[prev_mask, :] + dist[:, last])
+    # 이전 mask에 없는 도시는 dp가 inf(또는 큰 정수)라 자동으로 제외되고, argmin은 첫 최소값(작은 도시)을 고름
+    for layer in subset_layers(m)[2:]:
+        for last in range(m):
+            masks = layer[(layer >> last) & 1 == 1]
+            incoming = values[1:, last + 1]
+            for start in range(0, len(masks), VECTORIZED_CHUNK_MASKS):
+                chunk = masks[start:start + VECTORIZED_CHUNK_MASKS]
+                costs = dp[chunk ^ (1 << last)] + incoming
+                best_prev = np.argmin(costs, axis=1)
+                dp[chunk, last] = costs[np.arange(len(chunk)), best_prev]
+                if store_parents:
+                    parent[chunk, last] = best_prev + 1
+    
+    last_city = closing_city(dp[full_mask].astype(np.float64).tolist(), dist.tolist())
     if last_city == -1:
         return [], float('inf')
-        
+    
+    if store_parents:
+        path = reconstruct_path(parent.reshape(-1), m, last_city)
+    else:
+        path = rederive_path(dp, values, last_city)
+    final_cost = calculate_tour_cost(path, dist)
+    return path, final_cost
+
+def rederive_path(dp: np.ndarray, values: np.ndarray, last_city: int) -> List[int]:
+    # 부모 표 없이 복원: 순방향과 같은 dtype으로 dp[prev_mask, :] + dist[:, curr]의 argmin을 다시 계산
+    m = dp.shape[1]
     path = []
-    mask = final_mask
+    mask = (1 << m) - 1
     curr = last_city
-    
-    while mask and curr != -1:
+    while curr != 0:
         path.append(curr)
-        if (mask, curr) not in parent:
+        mask ^= 1 << (curr - 1)
+        curr = int(np.argmin(dp[mask] + values[1:, curr])) + 1 if mask else 0
+    path.append(0)
+    path.reverse()
+    return path
+
+# 작업 프로세스별 공유 DP 표 뷰 (_attach_shared_tables에서 설정)
+_shared_tables = {}
+
+def _attach_shared_tables(dp_name: str, parent_name: str, shape: Tuple[int, int], value_dtype: str, values: np.ndarray):
+    dp_memory = shared_memory.SharedMemory(name=dp_name)
+    parent_memory = shared_memory.SharedMemory(name=parent_name) if parent_name else None
+    _shared_tables.update(
+        memories=(dp_memory, parent_memory),
+        dp=np.ndarray(shape, dtype=value_dtype, buffer=dp_memory.buf),
+        parent=np.ndarray(shape, dtype=np.int8, buffer=parent_memory.buf) if parent_memory else None,
+        values=values,
+        layers=subset_layers(shape[1]),
+    )
+
+def _solve_layer_slice(size: int, start: int, stop: int):
+    # 한 층의 mask 구간을 모든 마지막 도시에 대해 계산 (다른 작업과 쓰는 행이 겹치지 않음)
+    dp, parent, values = _shared_tables["dp"], _shared_tables["parent"], _shared_tables["values"]
+    layer = _shared_tables["layers"][size][start:stop]
+    for last in range(dp.shape[1]):
+        masks = layer[(layer >> last) & 1 == 1]
+        incoming = values[1:, last + 1]
+        for chunk_start in range(0, len(masks), VECTORIZED_CHUNK_MASKS):
+            chunk = masks[chunk_start:chunk_start + VECTORIZED_CHUNK_MASKS]
+            costs = dp[chunk ^ (1 << last)] + incoming
+            best_prev = np.argmin(costs, axis=1)
+            dp[chunk, last] = costs[np.arange(len(chunk)), best_prev]
+            if parent is not None:
+                parent[chunk, last] = best_prev + 1
+
+def held_karp_parallel(tsp_data: TSPInstance, workers: int = None, memory_budget: int = HELD_KARP_MEMORY_BUDGET,
+                       cost_only: bool = False) -> Tuple[List[int], float]:
+    n = tsp_data.dimension
+    workers = workers or os.cpu_count() or 1
+    
+    if n < 2:
+        return list(range(n)), 0.0
+    
+    dist = np.asarray(tsp_data.oracle.rows(0, n), dtype=np.float64)
+    value_dtype, store_parents = held_karp_layout(n, dist, memory_budget, cost_only)
+    unreached = INT32_UNREACHED if value_dtype == np.int32 else np.inf
+    values = dist.astype(value_dtype)
+    
+    m = n - 1
+    full_mask = (1 << m) - 1
+    shape = (full_mask + 1, m)
+    dp_memory = shared_memory.SharedMemory(create=True, size=shape[0] * m * value_dtype.itemsize)
+    parent_memory = shared_memory.SharedMemory(create=True, size=shape[0] * m) if store_parents else None
+    try:
+        dp = np.ndarray(shape, dtype=value_dtype, buffer=dp_memory.buf)
+        dp.fill(unreached)
+        parent = None
+        if store_parents:
+            parent = np.ndarray(shape, dtype=np.int8, buffer=parent_memory.buf)
+            parent.fill(-1)
+        
+        singles = 1 << np.arange(m)
+        dp[singles, np.arange(m)] = values[0, 1:]
+        if store_parents:
+            parent[singles, np.arange(m)] = 0
+        
+        # 층마다 mask를 작업 수만큼 나눠 배분하고, 층이 끝날 때까지 기다린 뒤 다음 층으로 진행
+        layer_sizes = [len(layer) for layer in subset_layers(m)]
+        initargs = (dp_memory.name, parent_memory.name if parent_memory else None, shape, value_dtype.str, values)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_tables, initargs=initargs) as executor:
+            for size in range(2, m + 1):
+                bounds = np.linspace(0, layer_sizes[size], min(workers, layer_sizes[size]) + 1).astype(int).tolist()
+                slices = [executor.submit(_solve_layer_slice, size, bounds[i], bounds[i + 1])
+                          for i in range(len(bounds) - 1)]
+                for future in slices:
+                    future.result()
+        
+        last_city = closing_city(dp[full_mask].astype(np.float64).tolist(), dist.tolist())
+        if last_city == -1:
+            return [], float('inf')
+        
+        if store_parents:
+            path = reconstruct_path(parent.reshape(-1), m, last_city)
+        else:
+            path = rederive_path(dp, values, last_city)
+        del dp, parent
+    finally:
+        for memory in (dp_memory, parent_memory):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+    
+    final_cost = calculate_tour_cost(path, dist)
+    return path, final_cost
+
+def remaining_mst_bounds(masks: np.ndarray, dist: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # 같은 원소 수의 mask들에 대해 남은 도시 R과 MST(R ∪ {0})를 한 번에 계산 (배치 Prim)
+    m = dist.shape[0] - 1
+    in_mask = ((masks[:, None] >> np.arange(m)) & 1).astype(bool)
+    remaining = np.nonzero(~in_mask)[1].reshape(len(masks), -1) + 1
+    nodes = np.concatenate([np.zeros((len(masks), 1), dtype=remaining.dtype), remaining], axis=1)
+    size = nodes.shape[1]
+    
+    n = dist.shape[0]
+    flat_dist = dist.ravel()
+    rows = np.arange(len(masks))
+    key = np.take(flat_dist, nodes[:, :1] * n + nodes)
+    penalty = np.zeros((len(masks), size))  # 트리에 들어간 도시는 inf
+    penalty[:, 0] = np.inf
+    tree_cost = np.zeros(len(masks))
+    for _ in range(size - 1):
+        masked = key + penalty
+        nearest = np.argmin(masked, axis=1)
+        tree_cost += masked[rows, nearest]
+        penalty[rows, nearest] = np.inf
+        key = np.minimum(key, np.take(flat_dist, nodes[rows, nearest][:, None] * n + nodes))
+    return remaining, tree_cost
+
+def completion_bounds(keys: np.ndarray, dist: np.ndarray) -> np.ndarray:
+    # 하한: last에서 R로 가는 최소 간선 + MST(R ∪ {0}) (R이 비면 last에서 0으로 복귀)
+    m = dist.shape[0] - 1
+    masks, lasts = keys // m, keys % m
+    unique_masks, mask_index = np.unique(masks, return_inverse=True)
+    remaining, tree_cost = remaining_mst_bounds(unique_masks, dist)
+    if not remaining.shape[1]:
+        return dist[lasts + 1, 0]
+    first_step = dist[lasts[:, None] + 1, remaining[mask_index]].min(axis=1)
+    return first_step + tree_cost[mask_index]
+
+def pruning_upper_bound(tsp_data: TSPInstance) -> Tuple[List[int], float]:
+    # 상한이 최적에 가까울수록 가지치기가 강해지므로 모든 출발 도시의 최근접 이웃 + 최원 삽입에 2-opt를 적용해 최선 선택
+    n = tsp_data.dimension
+    # 호출한 쪽의 instance.candidates(와 후보 캐시 파일)를 덮어쓰지 않도록 지역 후보 사용
+    candidates = knn_candidates(tsp_data, n - 1)
+    starts = [nearest_neighbor_tour(tsp_data, start)[0] for start in range(n)]
+    starts.append(farthest_insertion_tour(tsp_data)[0])
+    return min((two_opt_candidates(tsp_data, tour, candidates) for tour in starts), key=lambda result: result[1])
+
+def held_karp_pruned(tsp_data: TSPInstance, upper_bound: float = None) -> Tuple[List[int], float]:
+    n = tsp_data.dimension
+    
+    if n < 4:
+        return held_karp_vectorized(tsp_data)
+    
+    dist = np.asarray(tsp_data.oracle.rows(0, n), dtype=np.float64)
+    heuristic_tour = None
+    if upper_bound is None:
+        heuristic_tour, upper_bound = pruning_upper_bound(tsp_data)
+    # 휴리스틱 투어가 이미 최적이어도 그 상태들이 남도록 약간의 여유
+    threshold = upper_bound * (1 + 1e-9) + 1e-9
+    
+    # 상태 (mask, last)를 key = mask * m + last로 층마다 정렬된 배열에 보관 (비트 k = 도시 k+1)
+    m = n - 1
+    cities = np.arange(m, dtype=np.int64)
+    keys = (1 << cities) * m + cities
+    costs = dist[0, 1:].copy()
+    layers = [(keys, np.zeros(m, dtype=np.int64))]
+    
+    for _ in range(2, m + 1):
+        masks, lasts = keys // m, keys % m
+        
+        # 방문하지 않은 도시 하나를 덧붙여 다음 층 후보 상태 생성
+        new_keys, new_costs, new_parents = [], [], []
+        for city in range(m):
+            open_states = ((masks >> city) & 1) == 0
+            new_keys.append((masks[open_states] | (1 << city)) * m + city)
+            new_costs.append(costs[open_states] + dist[lasts[open_states] + 1, city + 1])
+            new_parents.append(lasts[open_states])
+        new_keys = np.concatenate(new_keys)
+        new_costs = np.concatenate(new_costs)
+        new_parents = np.concatenate(new_parents)
+        
+        # 같은 상태는 비용이 가장 작고 (동률이면) 직전 도시 번호가 작은 것만 남김
+        order = np.lexsort((new_parents, new_costs, new_keys))
+        new_keys, new_costs, new_parents = new_keys[order], new_costs[order], new_parents[order]
+        first = np.ones(len(new_keys), dtype=bool)
+        first[1:] = new_keys[1:] != new_keys[:-1]
+        keys, costs, parents = new_keys[first], new_costs[first], new_parents[first]
+        
+        # 하한: 현재 비용 + last에서 R로 가는 최소 간선 + MST(R ∪ {0}) (R이 비면 last에서 0으로 복귀)
+        keep = np.empty(len(keys), dtype=bool)
+        for start in range(0, len(keys), PRUNING_CHUNK_STATES):
+            chunk = slice(start, start + PRUNING_CHUNK_STATES)
+            keep[chunk] = costs[chunk] + completion_bounds(keys[chunk], dist) <= threshold
+        keys, costs, parents = keys[keep], costs[keep], parents[keep]
+        layers.append((keys, parents))
+        if not len(keys):
             break
-        next_curr = parent[(mask, curr)]
-        mask ^= (1 << curr)
-        curr = next_curr
     
-    if not path or path[-1] != 0:
-        path.append(0)
+    if not len(keys):
+        # 모든 상태가 가지치기됨: 상한보다 좋은 투어가 없으므로 휴리스틱 투어가 최적
+        if heuristic_tour is None:
+            raise ValueError(f"No tour is shorter than the upper bound {upper_bound}")
+        return heuristic_tour, upper_bound
+    
+    lasts = keys % m
+    totals = costs + dist[lasts + 1, 0]
+    best = int(np.argmin(totals))
+    
+    path = []
+    mask = (1 << m) - 1
+    curr = int(lasts[best])
+    for layer_keys, layer_parents in reversed(layers):
+        path.append(curr + 1)
+        index = int(np.searchsorted(layer_keys, mask * m + curr))
+        mask ^= 1 << curr
+        curr = int(layer_parents[index])
+    path.append(0)
     path.reverse()
     
     final_cost = calculate_tour_cost(path, dist)
     return path, final_cost
 
-def solve_held_karp(tsp_data: TSPInstance, limit: int = 20) -> Tuple[List[int], float]:
-    return held_karp_simple(tsp_data)
+def solve_held_karp(tsp_data: TSPInstance, limit: int = 20, mode: str = "vectorized",
+                    memory_budget: int = HELD_KARP_MEMORY_BUDGET, cost_only: bool = False,
+                    workers: int = None) -> Tuple[List[int], float]:
+    if mode not in HELD_KARP_MODES:
+        raise ValueError(f"Unknown Held-Karp mode: {mode}")
+    # 모드가 쓰지 않는 옵션이 기본값이 아니면 조용히 무시하지 않고 거부
+    options = {"memory_budget": memory_budget != HELD_KARP_MEMORY_BUDGET,
+               "cost_only": cost_only, "workers": workers is not None}
+    for option, given in options.items():
+        if given and option not in HELD_KARP_MODE_OPTIONS[mode]:
+            raise ValueError(f"Held-Karp mode '{mode}' does not support {option}")
+    check_city_limit(tsp_data.dimension, limit)
+    if mode == "vectorized":
+        return held_karp_vectorized(tsp_data, memory_budget, cost_only)
+    if mode == "parallel":
+        return held_karp_parallel(tsp_data, workers, memory_budget, cost_only)
+    if mode == "simple":
+        return held_karp_simple(tsp_data, limit)
+    return HELD_KARP_MODES[mode](tsp_data)
+
+HELD_KARP_MODES = {
+    "simple": held_karp_simple,
+    "vectorized": held_karp_vectorized,
+    "parallel": held_karp_parallel,
+    "pruned": held_karp_pruned,
+}
+
+# 모드별로 solve_held_karp에서 받는 옵션
+HELD_KARP_MODE_OPTIONS = {
+    "simple": (),
+    "vectorized": ("memory_budget", "cost_only"),
+    "parallel": ("memory_budget", "cost_only", "workers"),
+    "pruned": (),
+}
 
 if __name__ == "__main__":
     from utils.tsp_parser import load_tsp_instances
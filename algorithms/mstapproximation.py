@@ -5,11 +5,24 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from typing import List, Tuple
+import math
 import time
+
+import numpy as np
+
 from utils.tsp_parser import TSPInstance
 from utils.evaluator import calculate_tour_cost
+from utils.candidates import build_candidates, delaunay_graph
+from utils.indexed_heap import IndexedMinHeap
+from utils.union_find import UnionFind
 
+# 평면 유클리드 거리에 단조인 타입 (들로네 그래프가 MST를 포함)
+EUCLIDEAN_EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "ATT")
+MST_CANDIDATE_GRAPHS = ("auto", "delaunay", "candidates")
 
+# 원시 거리(반올림 전)를 정하는 좌표 노름. 반올림(nint, ceil, ATT)은 단조이므로 이 노름의
+# 최근접 도시가 실제 거리로도 최근접이다. GEO는 평면 좌표가 아니라 제외
+EXIT_SEARCH_NORMS = {"EUC_2D": 2, "CEIL_2D": 2, "ATT": 2, "MAN_2D": 1, "MAX_2D": math.inf}
 
 def solve_mst_prim(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     num_cities = tsp_instance.dimension
@@ -23,7 +36,7 @@ def solve_mst_prim(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     
     min_cost = []
     for i in range(num_cities):
-        min_cost.append(999999)
+        min_cost.append(float('inf'))
     
     parent_node = []
     for i in range(num_cities):
@@ -31,6 +44,7 @@ def solve_mst_prim(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     
     min_cost[0] = 0
     tree_edges = []
+    oracle = tsp_instance.oracle
     
     for step in range(num_cities):
         current_min = -1
@@ -44,13 +58,10 @@ def solve_mst_prim(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
             edge = (parent_node[current_min], current_min)
             tree_edges.append(edge)
         
+        distance_row = oracle.row(current_min).tolist()
         for neighbor in range(num_cities):
             if is_visited[neighbor] == False:
-                distance = 0
-                if tsp_instance.large_instance:
-                    distance = tsp_instance.get_distance(current_min, neighbor)
-                else:
-                    distance = tsp_instance.distance_matrix[current_min][neighbor]
+                distance = distance_row[neighbor]
                 if distance < min_cost[neighbor]:
                     min_cost[neighbor] = distance
                     parent_node[neighbor] = current_min
@@ -58,20 +69,52 @@ def solve_mst_prim(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     result_tour, result_cost = build_tour_from_mst(tree_edges, num_cities, tsp_instance)
     return result_tour, result_cost
 
+def solve_mst_prim_vectorized(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
+    num_cities = tsp_instance.dimension
+    
+    if num_cities < 3:
+        raise ValueError("Too few cities")
+    
+    tree_edges = dense_prim_edges(tsp_instance)
+    return build_tour_from_mst(tree_edges, num_cities, tsp_instance)
+
+def dense_prim_edges(tsp_instance: TSPInstance) -> List[Tuple[int, int]]:
+    num_cities = tsp_instance.dimension
+    oracle = tsp_instance.oracle
+    min_cost = np.full(num_cities, np.inf)
+    parent_node = np.full(num_cities, -1, dtype=np.int64)
+    is_visited = np.zeros(num_cities, dtype=bool)
+    min_cost[0] = 0.0
+    tree_edges = []
+    
+    for step in range(num_cities):
+        # 방문한 도시는 inf이므로 argmin이 미방문 최소 비용 도시 (동점이면 작은 번호)
+        current_min = int(np.argmin(min_cost))
+        is_visited[current_min] = True
+        min_cost[current_min] = np.inf
+        if parent_node[current_min] != -1:
+            tree_edges.append((int(parent_node[current_min]), current_min))
+        
+        distance_row = oracle.row(current_min)
+        improved = distance_row < min_cost
+        improved &= ~is_visited
+        min_cost[improved] = distance_row[improved]
+        parent_node[improved] = current_min
+    
+    return tree_edges
+
 def solve_mst_kruskal(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     total_cities = tsp_instance.dimension
     
     if total_cities < 3:
         raise ValueError("Too few cities")
     
+    oracle = tsp_instance.oracle
     all_edges_list = []
     for city1 in range(total_cities):
+        distance_row = oracle.row(city1).tolist()
         for city2 in range(city1 + 1, total_cities):
-            edge_weight = 0
-            if tsp_instance.large_instance:
-                edge_weight = tsp_instance.get_distance(city1, city2)
-            else:
-                edge_weight = tsp_instance.distance_matrix[city1][city2]
+            edge_weight = distance_row[city2]
             new_edge = (edge_weight, city1, city2)
             all_edges_list.append(new_edge)
     
@@ -80,27 +123,12 @@ def solve_mst_kruskal(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
         sorted_edges.append(all_edges_list[i])
     sorted_edges.sort()
     
-    node_parent = []
-    for i in range(total_cities):
-        node_parent.append(i)
-    
-    def find_root(node):
-        if node_parent[node] != node:
-            node_parent[node] = find_root(node_parent[node])
-        return node_parent[node]
-    
-    def connect_nodes(node1, node2):
-        root1 = find_root(node1)
-        root2 = find_root(node2)
-        if root1 != root2:
-            node_parent[root1] = root2
-            return True
-        return False
+    components = UnionFind(total_cities)
     
     selected_edges = []
     for i in range(len(sorted_edges)):
         weight, node1, node2 = sorted_edges[i]
-        if connect_nodes(node1, node2):
+        if components.union(node1, node2):
             selected_edges.append((node1, node2))
             if len(selected_edges) == total_cities - 1:
                 break
@@ -108,6 +136,28 @@ def solve_mst_kruskal(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     final_tour, final_cost = build_tour_from_mst(selected_edges, total_cities, tsp_instance)
     return final_tour, final_cost
 
+def solve_mst_kruskal_sparse(tsp_instance: TSPInstance, graph: str = "auto") -> Tuple[List[int], float]:
+    num_cities = tsp_instance.dimension
+    if num_cities < 3:
+        raise ValueError("Too few cities")
+    
+    # 후보 간선을 병렬 배열로 두고 (가중치, i, j) 순으로 정렬 (밀집 Kruskal의 튜플 정렬과 같은 순서)
+    first, second = mst_candidate_graph(tsp_instance, graph)
+    weights = np.asarray(tsp_instance.oracle.pairs(first, second), dtype=np.float64)
+    order = np.lexsort((second, first, weights))
+    
+    components = UnionFind(num_cities)
+    selected_edges = []
+    for node1, node2 in zip(first[order].tolist(), second[order].tolist()):
+        if components.union(node1, node2):
+            selected_edges.append((node1, node2))
+            if len(selected_edges) == num_cities - 1:
+                break
+    if len(selected_edges) != num_cities - 1:
+        raise ValueError("Candidate graph is not connected")
+    
+    return build_tour_from_mst(selected_edges, num_cities, tsp_instance)
+
 def build_tour_from_mst(mst_edges: List[Tuple[int, int]], n: int, tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     adjacency_lists = []
     for city_index in range(n):
@@ -158,13 +208,137 @@ def build_tour_from_mst(mst_edges: List[Tuple[int, int]], n: int, tsp_instance:
         if city_visited[remaining_city] == False:
             hamiltonian_cycle.append(remaining_city)
     
-    tour_cost = calculate_tour_cost(hamiltonian_cycle, tsp_instance.distance_matrix, tsp_instance)
+    tour_cost = calculate_tour_cost(hamiltonian_cycle, instance=tsp_instance)
     return hamiltonian_cycle, tour_cost
 
+def mst_candidate_graph(tsp_instance: TSPInstance, graph: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+    if graph not in MST_CANDIDATE_GRAPHS:
+        raise ValueError(f"Unknown candidate graph: {graph}")
+    euclidean = tsp_instance.has_coordinates and tsp_instance.edge_weight_type in EUCLIDEAN_EDGE_WEIGHT_TYPES
+    if graph == "delaunay" or (graph == "auto" and euclidean):
+        if not euclidean:
+            raise ValueError("Delaunay graph needs Euclidean coordinates")
+        edges = np.asarray(delaunay_graph(tsp_instance), dtype=np.int64)
+        return edges[:, 0], edges[:, 1]
+    
+    # 인스턴스에 이미 있는 후보 목록(kNN/사분면)을 그대로 사용하고, 없으면 kNN 후보 생성
+    # 후보 그래프가 여러 조각이면 가장 큰 조각을 뺀 각 조각에서 바깥으로 가장 가까운 간선을 추가
+    n = tsp_instance.dimension
+    candidates = tsp_instance.candidates
+    if candidates is None:
+        candidates = build_candidates(tsp_instance, 10)
+    candidates = np.asarray(candidates, dtype=np.int64)
+    first = np.repeat(np.arange(n, dtype=np.int64), candidates.shape[1])
+    second = candidates.ravel()
+    while True:
+        component = connected_components(n, first, second)
+        order = np.argsort(component, kind="stable")
+        groups = np.split(order, np.flatnonzero(np.diff(component[order])) + 1)
+        if len(groups) == 1:
+            break
+        # 가장 큰 조각을 뺀 조각마다 바깥으로 가장 짧은 간선 (컷 성질로 MST 간선)
+        largest = max(range(len(groups)), key=lambda index: len(groups[index]))
+        extra_first, extra_second = [], []
+        for index, members in enumerate(groups):
+            if index == largest:
+                continue
+            city, outside = nearest_exit(tsp_instance, members)
+            extra_first.append(city)
+            extra_second.append(outside)
+        first = np.concatenate([first, extra_first])
+        second = np.concatenate([second, extra_second])
+    return np.minimum(first, second), np.maximum(first, second)
+
+def nearest_exit(tsp_instance: TSPInstance, members: np.ndarray) -> Tuple[int, int]:
+    """
+    조각 members에서 조각 밖 도시로 가는 가장 짧은 간선 (조각 안 도시, 바깥 도시)
+
+    평면 좌표 타입은 조각 도시를 KD-트리에서 잠시 지우고 도시마다 거리 타입의 노름으로
+    남은 도시 중 최근접을 찾는다. 그 밖의 타입(GEO, EXPLICIT)은 거리 행 전체를 비교한다.
+    """
+    oracle = tsp_instance.oracle
+    best_distance, best_pair = float('inf'), None
+    norm = EXIT_SEARCH_NORMS.get(tsp_instance.edge_weight_type) if tsp_instance.has_coordinates else None
+    if norm is None:
+        for city in members.tolist():
+            row = np.array(oracle.row(city), dtype=np.float64)
+            row[members] = np.inf
+            nearest = int(np.argmin(row))
+            if row[nearest] < best_distance:
+                best_distance, best_pair = row[nearest], (city, nearest)
+        return best_pair
+
+    tree = tsp_instance.spatial_index("kdtree")
+    tree.reset()
+    for city in members.tolist():
+        tree.remove(city)
+    try:
+        for city, (x, y) in zip(members.tolist(), tsp_instance.coords[members].tolist()):
+            nearest = tree.nearest_in_norm(x, y, norm, live_only=True)
+            distance = oracle.get(city, nearest)
+            if distance < best_distance:
+                best_distance, best_pair = distance, (city, nearest)
+    finally:
+        for city in members.tolist():
+            tree.restore(city)
+    return best_pair
+
+def connected_components(n: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    components = UnionFind(n)
+    for i, j in zip(first.tolist(), second.tolist()):
+        components.union(i, j)
+    return np.array(components.labels(), dtype=np.int64)
+
+def sparse_prim_edges(n: int, first: np.ndarray, second: np.ndarray,
+                      weights: np.ndarray) -> List[Tuple[int, int]]:
+    # 인접 리스트 (CSR): 양방향 간선을 출발 도시 순으로 정렬
+    sources = np.concatenate([first, second])
+    targets = np.concatenate([second, first])
+    both_weights = np.concatenate([weights, weights])
+    order = np.lexsort((targets, sources))
+    offsets = np.searchsorted(sources[order], np.arange(n + 1)).tolist()
+    targets = targets[order].tolist()
+    both_weights = both_weights[order].tolist()
+    
+    # 밀집 Prim과 같은 순서: 비용이 같으면 작은 도시, 부모는 더 작은 비용을 처음 준 도시
+    heap = IndexedMinHeap(n)
+    parent_node = [-1] * n
+    is_visited = [False] * n
+    tree_edges = []
+    heap.push(0, 0.0)
+    while heap:
+        city, cost = heap.pop()
+        is_visited[city] = True
+        if parent_node[city] != -1:
+            tree_edges.append((parent_node[city], city))
+        for index in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[index]
+            if not is_visited[neighbor] and heap.push_or_decrease(neighbor, both_weights[index]):
+                parent_node[neighbor] = city
+    return tree_edges
+
+def solve_mst_euclidean(tsp_instance: TSPInstance, graph: str = "auto") -> Tuple[List[int], float]:
+    num_cities = tsp_instance.dimension
+    if num_cities < 3:
+        raise ValueError("Too few cities")
+    
+    first, second = mst_candidate_graph(tsp_instance, graph)
+    weights = tsp_instance.oracle.pairs(first, second)
+    tree_edges = sparse_prim_edges(num_cities, first, second, weights)
+    if len(tree_edges) != num_cities - 1:
+        raise ValueError("Candidate graph is not connected")
+    
+    return build_tour_from_mst(tree_edges, num_cities, tsp_instance)
+
 def solve_mst_approx(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     city_count = tsp_instance.dimension
+    # 거리 행렬(밀집 또는 condensed)이 있으면 크기와 관계없이 벡터화 밀집 Prim이 더 빠름
+    # (experiments/bench_mst.py, kz9976: 벡터화 0.45초, 들로네 0.99초, kNN 1.45초)
+    # 행렬이 없어 거리를 실시간 계산하는 경우에만 희소 후보 그래프 위에서 MST 계산
+    if tsp_instance.matrix is None or tsp_instance.large_instance:
+        return solve_mst_euclidean(tsp_instance)
     if city_count < 500:
-        prim_result_tour, prim_result_cost = solve_mst_prim(tsp_instance)
+        prim_result_tour, prim_result_cost = solve_mst_prim_vectorized(tsp_instance)
         kruskal_result_tour, kruskal_result_cost = solve_mst_kruskal(tsp_instance)
         
         if prim_result_cost <= kruskal_result_cost:
@@ -176,15 +350,16 @@ def solve_mst_approx(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
             best_cost = kruskal_result_cost
             return best_tour, best_cost
     else:
-        final_tour, final_cost = solve_mst_prim(tsp_instance)
+        final_tour, final_cost = solve_mst_prim_vectorized(tsp_instance)
         return final_tour, final_cost
 
 if __name__ == "__main__":
     from utils.tsp_parser import load_tsp_instances
     
     tsp_data = load_tsp_instances()
-    for dataset_name, instance in tsp_data.items():
-        if dataset_name in ['test15']:
+    for dataset_name in ['test15']:
+        if dataset_name in tsp_data:
+            instance = tsp_data[dataset_name]
             print(f"\nTesting {dataset_name}:")
             
             start = time.time()
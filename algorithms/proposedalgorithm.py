@@ -3,29 +3,59 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import time
+from collections import deque
 from typing import List, Tuple
+
+import numpy as np
+
 from utils.tsp_parser import TSPInstance
 from utils.evaluator import calculate_tour_cost
+from utils.candidates import build_candidates
 
 def get_distance(tsp_instance: TSPInstance, i: int, j: int) -> float:
-    if tsp_instance.large_instance:
-        return tsp_instance.get_distance(i, j)
-    else:
-        return tsp_instance.distance_matrix[i][j]
+    return tsp_instance.get_distance(i, j)
 
 def nearest_neighbor_tour(tsp_instance: TSPInstance, start: int = 0) -> Tuple[List[int], float]:
+    if use_grid_index(tsp_instance):
+        return grid_nearest_neighbor_tour(tsp_instance, start)
+    
     n = tsp_instance.dimension
     tour = [start]
     unvisited = set(range(n)) - {start}
     current = start
+    oracle = tsp_instance.oracle
     
     while unvisited:
-        nearest = min(unvisited, key=lambda city: get_distance(tsp_instance, current, city))
+        distance_row = oracle.row(current).tolist()
+        nearest = min(unvisited, key=distance_row.__getitem__)
         tour.append(nearest)
         unvisited.remove(nearest)
         current = nearest
     
-    cost = calculate_tour_cost(tour, tsp_instance.distance_matrix, tsp_instance)
+    cost = calculate_tour_cost(tour, instance=tsp_instance)
+    return tour, cost
+
+def use_grid_index(tsp_instance: TSPInstance) -> bool:
+    # 격자 인덱스의 유클리드 거리가 인스턴스 거리와 같을 때만 사용
+    return (tsp_instance.has_coordinates and tsp_instance.edge_weight_type == "EUC_2D"
+            and not tsp_instance.tsplib_rounding)
+
+def grid_nearest_neighbor_tour(tsp_instance: TSPInstance, start: int = 0) -> Tuple[List[int], float]:
+    n = tsp_instance.dimension
+    grid = tsp_instance.spatial_index("grid")
+    grid.reset()
+    
+    tour = [start]
+    grid.remove(start)
+    current = start
+    
+    for step in range(n - 1):
+        nearest = grid.nearest_unvisited(current)
+        tour.append(nearest)
+        grid.remove(nearest)
+        current = nearest
+    
+    cost = calculate_tour_cost(tour, instance=tsp_instance)
     return tour, cost
 
 def farthest_insertion_tour(tsp_instance: TSPInstance, start: int = 0) -> Tuple[List[int], float]:
@@ -33,36 +63,33 @@ def farthest_insertion_tour(tsp_instance: TSPInstance, start: int = 0) -> Tuple[
     if n <= 2:
         return nearest_neighbor_tour(tsp_instance, start)
     
+    oracle = tsp_instance.oracle
     tour = [start]
-    unvisited = set(range(n)) - {start}
+    # 도시별 현재 투어까지의 최소 거리 (투어에 들어간 도시는 -inf)
+    tour_distance = np.array(oracle.row(start), dtype=np.float64)
+    tour_distance[start] = -np.inf
     
-    farthest = max(unvisited, key=lambda city: get_distance(tsp_instance, start, city))
+    farthest = int(np.argmax(tour_distance))
     tour.append(farthest)
-    unvisited.remove(farthest)
+    tour_distance = np.minimum(tour_distance, oracle.row(farthest))
+    tour_distance[farthest] = -np.inf
     
-    while unvisited:
-        best_city = max(unvisited, 
-                       key=lambda city: min(get_distance(tsp_instance, city, tour_city) 
-                                           for tour_city in tour))
+    for step in range(n - 2):
+        # 투어에서 가장 먼 도시 (동률이면 작은 번호)
+        best_city = int(np.argmax(tour_distance))
+        best_row = np.asarray(oracle.row(best_city), dtype=np.float64)
         
-        best_pos = 0
-        best_increase = float('inf')
-        
-        for i in range(len(tour)):
-            j = (i + 1) % len(tour)
-            old_cost = get_distance(tsp_instance, tour[i], tour[j])
-            new_cost = (get_distance(tsp_instance, tour[i], best_city) + 
-                       get_distance(tsp_instance, best_city, tour[j]))
-            increase = new_cost - old_cost
-            
-            if increase < best_increase:
-                best_increase = increase
-                best_pos = i + 1
+        # 모든 간선 (tour[i], tour[i+1])에 끼워 넣을 때의 증가량 중 첫 최소 위치
+        order = np.asarray(tour, dtype=np.intp)
+        next_order = np.roll(order, -1)
+        increase = (best_row[order] + best_row[next_order]) - oracle.pairs(order, next_order)
+        best_pos = int(np.argmin(increase)) + 1
         
         tour.insert(best_pos, best_city)
-        unvisited.remove(best_city)
+        tour_distance = np.minimum(tour_distance, best_row)
+        tour_distance[best_city] = -np.inf
     
-    cost = calculate_tour_cost(tour, tsp_instance.distance_matrix, tsp_instance)
+    cost = calculate_tour_cost(tour, instance=tsp_instance)
     return tour, cost
 
 def simple_branch_bound(tsp_instance: TSPInstance, time_limit: int = 10) -> Tuple[List[int], float]:
@@ -75,6 +102,12 @@ def simple_branch_bound(tsp_instance: TSPInstance, time_limit: int = 10) -> Tupl
     
     start_time = time.time()
     nodes_checked = 0
+    # 15개 도시 이하이므로 거리 행을 파이썬 리스트로 한 번 변환해 스칼라 루프에서 사용
+    oracle = tsp_instance.oracle
+    distance_rows = [oracle.row(city).tolist() for city in range(n)]
+    
+    def distance(i: int, j: int) -> float:
+        return distance_rows[i][j]
     
     def bound_calculation(partial_tour: List[int], remaining: set) -> float:
         if len(remaining) <= 1:
@@ -89,7 +122,7 @@ def simple_branch_bound(tsp_instance: TSPInstance, time_limit: int = 10) -> Tupl
             min_edge = float('inf')
             for j in range(len(cities)):
                 if i != j:
-                    dist = get_distance(tsp_instance, cities[i], cities[j])
+                    dist = distance(cities[i], cities[j])
                     min_edge = min(min_edge, dist)
             min_cost += min_edge
         
@@ -115,7 +148,7 @@ def simple_branch_bound(tsp_instance: TSPInstance, time_limit: int = 10) -> Tupl
         
         current_city = current_tour[-1]
         for next_city in remaining:
-            new_cost = current_cost + get_distance(tsp_instance, current_city, next_city)
+            new_cost = current_cost + distance(current_city, next_city)
             if new_cost < best_cost:
                 new_remaining = remaining - {next_city}
                 branch_bound_recursive(current_tour + [next_city], new_remaining, new_cost)
@@ -125,6 +158,148 @@ def simple_branch_bound(tsp_instance: TSPInstance, time_limit: int = 10) -> Tupl
     
     return best_tour, best_cost
 
+def greedy_candidate_tour(tsp_instance: TSPInstance, candidates: np.ndarray = None) -> Tuple[List[int], float]:
+    n = tsp_instance.dimension
+    if candidates is None:
+        candidates = tsp_instance.candidates if tsp_instance.candidates is not None else build_candidates(tsp_instance)
+    
+    # 후보 간선 (i < j) 중복 제거 후 짧은 순서로
+    rows = np.repeat(np.arange(n, dtype=np.int64), candidates.shape[1])
+    cols = np.asarray(candidates, dtype=np.int64).ravel()
+    keys = np.unique(np.minimum(rows, cols) * n + np.maximum(rows, cols))
+    first, second = keys // n, keys % n
+    weights = tsp_instance.oracle.pairs(first, second)
+    order = np.lexsort((second, first, weights))
+    
+    degree = [0] * n
+    fragment = list(range(n))
+    neighbors = [[] for _ in range(n)]
+    
+    def find(city):
+        while fragment[city] != city:
+            fragment[city] = fragment[fragment[city]]
+            city = fragment[city]
+        return city
+    
+    for i, j in zip(first[order].tolist(), second[order].tolist()):
+        if degree[i] < 2 and degree[j] < 2:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                fragment[root_i] = root_j
+                degree[i] += 1
+                degree[j] += 1
+                neighbors[i].append(j)
+                neighbors[j].append(i)
+    
+    # 조각(경로)들을 끝점 기준 최근접 순서로 연결
+    paths = []
+    seen = [False] * n
+    for city in range(n):
+        if degree[city] < 2 and not seen[city]:
+            path = [city]
+            seen[city] = True
+            previous, current = -1, city
+            while True:
+                following = [other for other in neighbors[current] if other != previous]
+                if not following or seen[following[0]]:
+                    break
+                previous, current = current, following[0]
+                path.append(current)
+                seen[current] = True
+            paths.append(path)
+    
+    heads = np.array([path[0] for path in paths], dtype=np.int64)
+    tails = np.array([path[-1] for path in paths], dtype=np.int64)
+    remaining = np.ones(len(paths), dtype=bool)
+    remaining[0] = False
+    tour = list(paths[0])
+    for step in range(len(paths) - 1):
+        candidates_left = np.flatnonzero(remaining)
+        current = np.full(len(candidates_left), tour[-1])
+        head_distance = tsp_instance.oracle.pairs(current, heads[candidates_left])
+        tail_distance = tsp_instance.oracle.pairs(current, tails[candidates_left])
+        best_head, best_tail = int(np.argmin(head_distance)), int(np.argmin(tail_distance))
+        if head_distance[best_head] <= tail_distance[best_tail]:
+            chosen = int(candidates_left[best_head])
+            tour.extend(paths[chosen])
+        else:
+            chosen = int(candidates_left[best_tail])
+            tour.extend(reversed(paths[chosen]))
+        remaining[chosen] = False
+    
+    cost = calculate_tour_cost(tour, instance=tsp_instance)
+    return tour, cost
+
+def two_opt_candidates(tsp_instance: TSPInstance, tour: List[int],
+                       candidates: np.ndarray = None) -> Tuple[List[int], float]:
+    n = len(tour)
+    if candidates is None:
+        candidates = tsp_instance.candidates if tsp_instance.candidates is not None else build_candidates(tsp_instance)
+    candidate_lists = np.asarray(candidates).tolist()
+    distance = tsp_instance.oracle.get
+    
+    tour = list(tour)
+    position = [0] * n
+    for index, city in enumerate(tour):
+        position[city] = index
+    
+    def reverse(i, j):
+        # tour[i..j] (순환 구간)를 뒤집되, 더 짧은 쪽을 뒤집음
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for step in range(length // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            position[b], position[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+    
+    # don't-look bits: 개선이 없던 도시는 주변이 바뀔 때까지 건너뜀
+    queue = deque(tour)
+    queued = [True] * n
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        improved = False
+        
+        for forward in (True, False):
+            i = position[a]
+            b = tour[(i + 1) % n] if forward else tour[(i - 1) % n]
+            removed_ab = distance(a, b)
+            for c in candidate_lists[a]:
+                added_ac = distance(a, c)
+                if added_ac >= removed_ab:
+                    break
+                j = position[c]
+                d = tour[(j + 1) % n] if forward else tour[(j - 1) % n]
+                if c == b or d == a:
+                    continue
+                delta = added_ac + distance(b, d) - removed_ab - distance(c, d)
+                if delta < -1e-10:
+                    if forward:
+                        reverse(position[b], j)
+                    else:
+                        reverse(j, position[b])
+                    for city in (a, b, c, d):
+                        if not queued[city]:
+                            queued[city] = True
+                            queue.append(city)
+                    improved = True
+                    break
+            if improved:
+                break
+    
+    cost = calculate_tour_cost(tour, instance=tsp_instance)
+    return tour, cost
+
+def solve_candidate_algorithm(tsp_instance: TSPInstance, k: int = 10, method: str = "knn") -> Tuple[List[int], float]:
+    if tsp_instance.candidates is None or tsp_instance.candidate_method != method or tsp_instance.candidates.shape[1] != min(k, tsp_instance.dimension - 1):
+        build_candidates(tsp_instance, k, method)
+    tour, cost = greedy_candidate_tour(tsp_instance)
+    return two_opt_candidates(tsp_instance, tour)
+
 def solve_hybrid_algorithm(tsp_instance: TSPInstance) -> Tuple[List[int], float]:
     n = tsp_instance.dimension
     
@@ -148,8 +323,9 @@ if __name__ == "__main__":
     from utils.tsp_parser import load_tsp_instances
     
     tsp_data = load_tsp_instances()
-    for name, instance in tsp_data.items():
-        if name in ['test15']:
+    for name in ['test15']:
+        if name in tsp_data:
+            instance = tsp_data[name]
             start_time = time.time()
             tour, cost = solve_hybrid_algorithm(instance)
             runtime = time.time() - start_time
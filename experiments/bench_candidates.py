@@ -0,0 +1,60 @@
+"""
+Candidate Set Benchmark
+kNN 후보와 사분면 후보로 만든 투어(후보 그리디 + 후보 2-opt)의 품질과 시간 비교
+
+실행: python experiments/bench_candidates.py [dataset_dir] [k] [--all]
+    --all: mona-lisa100K까지 포함 (수십 초 소요)
+"""
+
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tsp_parser import load_tsp_instances
+from utils.candidates import build_candidates
+from utils.evaluator import KNOWN_OPTIMAL_COSTS, is_valid_tour
+from algorithms.proposedalgorithm import greedy_candidate_tour, two_opt_candidates
+
+DEFAULT_DATASETS = ['a280', 'xql662', 'kz9976']
+
+def run_candidate_benchmark(dataset_dir: str = "dataset", k: int = 8, include_large: bool = False):
+    instances = load_tsp_instances(dataset_dir)
+    names = DEFAULT_DATASETS + (['mona-lisa100K'] if include_large else [])
+
+    print("🧭 CANDIDATE SET BENCHMARK")
+    print("=" * 86)
+    print(f"{'Dataset':<14} {'Method':<9} {'Build (s)':>9} {'Greedy':>13} {'2-opt':>13} "
+          f"{'Tour (s)':>9} {'Gap':>7}")
+    print("-" * 86)
+
+    for name in names:
+        if name not in instances:
+            continue
+        instance = instances[name]
+
+        for method in ('knn', 'quadrant'):
+            start_time = time.perf_counter()
+            build_candidates(instance, k, method)
+            build_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            greedy_tour, greedy_cost = greedy_candidate_tour(instance)
+            tour, cost = two_opt_candidates(instance, greedy_tour)
+            tour_time = time.perf_counter() - start_time
+
+            if not is_valid_tour(tour, instance.dimension):
+                print(f"❌ {name} ({method}): 유효하지 않은 투어")
+                continue
+
+            gap = ""
+            if name in KNOWN_OPTIMAL_COSTS:
+                gap = f"{100 * (cost / KNOWN_OPTIMAL_COSTS[name] - 1):6.2f}%"
+            print(f"{name:<14} {method:<9} {build_time:>9.3f} {greedy_cost:>13.1f} {cost:>13.1f} "
+                  f"{tour_time:>9.3f} {gap:>7}")
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+    run_candidate_benchmark(arguments[0] if arguments else "dataset",
+                            int(arguments[1]) if len(arguments) > 1 else 8,
+                            "--all" in sys.argv)
@@ -0,0 +1,53 @@
+"""
+Distance Cache Benchmark
+실시간 계산 오라클의 단건 조회(get)를 캐시 유무로 비교
+
+같은 도시 쌍을 반복해서 묻는 지역 탐색을 흉내 내기 위해 "hot" 도시 집합 안에서
+무작위 쌍을 뽑는다. hot 집합이 작을수록 적중률이 높다.
+
+실행: python experiments/bench_distance_cache.py [lookups]
+"""
+
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.distance_oracle import CachedOracle, CoordinateOracle
+
+EDGE_WEIGHT_TYPES = ['EUC_2D', 'ATT', 'GEO']
+HOT_SET_SIZES = [200, 2000, 20000]
+CITY_COUNT = 100000
+
+def time_lookups(get, pairs) -> float:
+    start_time = time.perf_counter()
+    for i, j in pairs:
+        get(i, j)
+    return time.perf_counter() - start_time
+
+def run_distance_cache_benchmark(lookups: int = 300000):
+    rng = np.random.default_rng(0)
+    # GEO 좌표 범위(DDD.MM)에 들어가도록 위도 0..90, 경도 0..180
+    coords = rng.random((CITY_COUNT, 2)) * np.array([90.0, 180.0])
+
+    print("🗃️  DISTANCE CACHE BENCHMARK")
+    print("=" * 66)
+    print(f"{'Metric':<8} {'Hot set':>8} {'Hit rate':>9} {'Raw (s)':>9} {'Cached (s)':>11} {'Speedup':>9}")
+    print("-" * 66)
+
+    for edge_weight_type in EDGE_WEIGHT_TYPES:
+        oracle = CoordinateOracle(coords, edge_weight_type)
+        for hot_set in HOT_SET_SIZES:
+            pairs = list(zip(rng.integers(0, hot_set, lookups).tolist(),
+                             rng.integers(0, hot_set, lookups).tolist()))
+            raw_time = time_lookups(oracle.get, pairs)
+            cached = CachedOracle(oracle)
+            cached_time = time_lookups(cached.get, pairs)
+            hit_rate = cached.cache_info()["hit_rate"]
+            print(f"{edge_weight_type:<8} {hot_set:>8} {hit_rate:>8.0%} {raw_time:>9.3f} {cached_time:>11.3f} "
+                  f"{raw_time / cached_time:>8.2f}x")
+
+if __name__ == "__main__":
+    run_distance_cache_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
@@ -0,0 +1,59 @@
+"""
+Held-Karp Parallel Benchmark
+층별 process-pool Held-Karp의 작업 프로세스 수에 따른 속도 향상 측정
+
+실행: python experiments/bench_held_karp.py [n] [max_workers]
+    n: 무작위 균등 분포 도시 수 (기본 20)
+    max_workers: 1, 2, 4, ...로 늘려 갈 최대 작업 수 (기본 CPU 코어 수)
+"""
+
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.tsp_parser import TSPInstance
+from utils.distance_matrix import build_distance_matrix
+from algorithms.heldkarp import held_karp_parallel, held_karp_vectorized
+
+def random_instance(n: int, seed: int = 0) -> TSPInstance:
+    coords = np.random.default_rng(seed).random((n, 2)) * 1000
+    return TSPInstance(f"random{n}", coords, build_distance_matrix(coords), n)
+
+def worker_counts(max_workers: int):
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    return counts + [max_workers]
+
+def run_held_karp_benchmark(n: int = 20, max_workers: int = None):
+    max_workers = max_workers or os.cpu_count() or 1
+    instance = random_instance(n)
+
+    print("🧮 HELD-KARP PARALLEL BENCHMARK")
+    print("=" * 52)
+    print(f"cities: {n}, CPU cores: {os.cpu_count()}")
+    print(f"{'Mode':<12} {'Workers':>8} {'Time (s)':>10} {'Speedup':>9} {'Cost':>9}")
+    print("-" * 52)
+
+    start_time = time.perf_counter()
+    reference_tour, reference_cost = held_karp_vectorized(instance)
+    base_time = time.perf_counter() - start_time
+    print(f"{'vectorized':<12} {1:>8} {base_time:>10.3f} {1.0:>8.2f}x {reference_cost:>9.2f}")
+
+    for workers in worker_counts(max_workers):
+        start_time = time.perf_counter()
+        tour, cost = held_karp_parallel(instance, workers)
+        elapsed = time.perf_counter() - start_time
+        if tour != reference_tour:
+            print(f"❌ workers={workers}: 단일 프로세스 결과와 다른 투어")
+            continue
+        print(f"{'parallel':<12} {workers:>8} {elapsed:>10.3f} {base_time / elapsed:>8.2f}x {cost:>9.2f}")
+
+if __name__ == "__main__":
+    run_held_karp_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+                            int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,67 @@
+"""
+MST Benchmark
+밀집 Prim (원본 / NumPy 벡터화)과 인덱스 힙 희소 Prim (들로네 / kNN 후보 그래프), 희소 Kruskal 비교
+
+실행: python experiments/bench_mst.py [dataset_dir] [--all]
+    --all: 원본 밀집 Prim을 kz9976에서도 실행하고 mona-lisa100K 희소 MST 포함 (수십 초 소요)
+"""
+
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tsp_parser import load_tsp_instances
+from utils.evaluator import is_valid_tour
+from algorithms.mstapproximation import (solve_mst_prim, solve_mst_prim_vectorized, solve_mst_euclidean,
+                                         solve_mst_kruskal_sparse)
+
+DEFAULT_DATASETS = ['a280', 'xql662', 'kz9976']
+
+# 원본 밀집 Prim은 O(n²) 파이썬 루프라 이 도시 수까지만 실행 (--all이면 제한 없음)
+DENSE_PYTHON_LIMIT = 5000
+
+def run_mst_benchmark(dataset_dir: str = "dataset", include_large: bool = False):
+    instances = load_tsp_instances(dataset_dir)
+    names = DEFAULT_DATASETS + (['mona-lisa100K'] if include_large else [])
+
+    variants = [
+        ("dense", lambda instance: solve_mst_prim(instance)),
+        ("vectorized", lambda instance: solve_mst_prim_vectorized(instance)),
+        ("delaunay", lambda instance: solve_mst_euclidean(instance, "delaunay")),
+        ("knn", lambda instance: solve_mst_euclidean(instance, "candidates")),
+        ("kruskal", lambda instance: solve_mst_kruskal_sparse(instance)),
+    ]
+
+    print("🌲 MST BENCHMARK")
+    print("=" * 64)
+    print(f"{'Dataset':<14} {'Variant':<11} {'Time (s)':>9} {'Tour cost':>15} {'Same':>6}")
+    print("-" * 64)
+
+    for name in names:
+        if name not in instances:
+            continue
+        instance = instances[name]
+        reference_tour = None
+
+        for variant, solve in variants:
+            if instance.matrix is None and variant in ("dense", "vectorized"):
+                continue
+            if variant == "dense" and instance.dimension > DENSE_PYTHON_LIMIT and not include_large:
+                continue
+
+            start_time = time.perf_counter()
+            tour, cost = solve(instance)
+            elapsed = time.perf_counter() - start_time
+
+            if not is_valid_tour(tour, instance.dimension):
+                print(f"❌ {name} ({variant}): 유효하지 않은 투어")
+                continue
+            if reference_tour is None:
+                reference_tour = tour
+            same = "✅" if tour == reference_tour else "-"
+            print(f"{name:<14} {variant:<11} {elapsed:>9.3f} {cost:>15.1f} {same:>6}")
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+    run_mst_benchmark(arguments[0] if arguments else "dataset", "--all" in sys.argv)
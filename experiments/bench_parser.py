@@ -0,0 +1,48 @@
+"""
+TSPLIB Parser Benchmark
+줄 단위 파싱과 벌크(벡터화) 좌표 파싱의 속도 비교
+
+실행: python experiments/bench_parser.py [dataset_dir]
+"""
+
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.tsp_parser import read_tsp_file
+
+def time_reader(file_path: str, bulk: bool, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        read_tsp_file(file_path, bulk=bulk)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def run_parser_benchmark(dataset_dir: str = "dataset", repeats: int = 3):
+    print("📂 TSPLIB PARSER BENCHMARK")
+    print("=" * 60)
+    print(f"{'Dataset':<16} {'Cities':>8} {'Line (s)':>10} {'Bulk (s)':>10} {'Speedup':>8}")
+    print("-" * 60)
+
+    for dataset_file in sorted(os.listdir(dataset_dir)):
+        if not dataset_file.endswith(".tsp"):
+            continue
+        file_path = os.path.join(dataset_dir, dataset_file)
+
+        _, _, line_coords = read_tsp_file(file_path, bulk=False)
+        _, _, bulk_coords = read_tsp_file(file_path, bulk=True)
+        if not np.array_equal(line_coords, bulk_coords):
+            print(f"❌ {dataset_file}: 파싱 결과 불일치")
+            continue
+
+        line_time = time_reader(file_path, False, repeats)
+        bulk_time = time_reader(file_path, True, repeats)
+        speedup = line_time / bulk_time if bulk_time > 0 else float('inf')
+        print(f"{dataset_file[:-4]:<16} {len(bulk_coords):>8} {line_time:>10.4f} {bulk_time:>10.4f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    run_parser_benchmark(sys.argv[1] if len(sys.argv) > 1 else "dataset")
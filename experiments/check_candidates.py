@@ -0,0 +1,46 @@
+"""
+Candidate Path Check
+KD-트리 경로와 행 블록(전수 비교) 경로의 후보 목록이 같은지 확인
+
+KD-트리 경로는 KD_TREE_THRESHOLD보다 큰 인스턴스에서만 쓰이므로, 같은 입력에 두 경로를
+직접 호출해 비교한다. 밀집 클러스터(가까운 4k개가 한 클러스터에 몰려 먼 사분면이 비는 경우),
+균일 분포, 격자 위 중복 좌표를 포함한다.
+
+실행: python experiments/check_candidates.py [n]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.tsp_parser import TSPInstance
+from utils.candidates import _block_knn, _block_quadrants, _kd_tree_knn, _kd_tree_quadrants
+
+CANDIDATE_COUNTS = [1, 3, 8, 10]
+
+def sample_point_sets(n: int):
+    rng = np.random.default_rng(0)
+    centers = rng.random((8, 2)) * 10000
+    yield "uniform", rng.random((n, 2)) * 1000
+    yield "clustered", centers[rng.integers(0, len(centers), n)] + rng.normal(0, 3, (n, 2))
+    yield "duplicates", np.round(rng.random((n, 2)) * 20)
+    yield "collinear", np.column_stack([rng.random(n) * 1000, np.zeros(n)])
+
+def run_candidate_check(n: int = 3000) -> bool:
+    print("🔍 CANDIDATE PATH CHECK (KD-tree vs brute force)")
+    print("=" * 48)
+    all_same = True
+    for name, coords in sample_point_sets(n):
+        instance = TSPInstance(name, coords, None, n, large_instance=True)
+        for k in CANDIDATE_COUNTS:
+            for method, block_path, tree_path in (("knn", _block_knn, _kd_tree_knn),
+                                                  ("quadrant", _block_quadrants, _kd_tree_quadrants)):
+                same = np.array_equal(block_path(instance, k), tree_path(instance, k))
+                all_same = all_same and same
+                print(f"{'✅' if same else '❌'} {name:<11} {method:<9} k={k}")
+    return all_same
+
+if __name__ == "__main__":
+    sys.exit(0 if run_candidate_check(int(sys.argv[1]) if len(sys.argv) > 1 else 3000) else 1)
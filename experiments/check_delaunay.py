@@ -0,0 +1,136 @@
+"""
+Delaunay Degenerate Input Check
+들로네 삼각분할을 전수 비교 결과와 대조해 정확 술어 대체 경로가 맞는지 확인
+
+필터링된 부동소수점 술어가 판단하지 못하는 입력(동일선상, 중복 좌표, 공원(共圓) 점,
+거의 동일선상)을 포함한다. 각 입력에 대해
+  1) 모든 삼각형의 외접원 안에 다른 점이 없고, 삼각형 넓이의 합이 볼록 껍질 넓이와 같은지
+     (Fraction 정확 산술로 전수 확인 - 껍질 근처 삼각형이 빠지지 않았는지까지 확인)
+  2) 들로네 간선만으로 만든 MST 가중치가 완전 그래프 MST 가중치와 같은지
+  3) 간선 그래프가 모든 점을 잇는 연결 그래프인지
+를 확인한다.
+
+실행: python experiments/check_delaunay.py [n]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fractions import Fraction
+
+import numpy as np
+
+from utils.delaunay import DelaunayTriangulation, delaunay_edges
+from utils.union_find import UnionFind
+
+def sample_point_sets(n: int):
+    rng = np.random.default_rng(0)
+    yield "uniform", rng.random((n, 2)) * 1000
+    yield "collinear", np.column_stack([np.arange(n) * 3.0, np.arange(n) * 2.0 + 5.0])
+    yield "duplicates", np.round(rng.random((n, 2)) * 6)
+    side = max(int(np.sqrt(n)), 2)
+    yield "grid", np.array([(x, y) for x in range(side) for y in range(side)], dtype=np.float64) * 10.0
+    # 반지름 5, 25, 65인 원 위의 정수 좌표 (중심이 같은 동심원, 모두 공원)
+    circle = [(x, y) for r in (5, 25, 65) for x in range(-r, r + 1) for y in range(-r, r + 1)
+              if x * x + y * y == r * r]
+    yield "cocircular", np.array(circle, dtype=np.float64)
+    base = rng.random(n) * 1000
+    yield "near-collinear", np.column_stack([base, base * 0.5 + rng.random(n) * 1e-9])
+
+def strictly_inside_circumcircle(a, b, c, d) -> bool:
+    """반시계 방향 삼각형 abc의 외접원 안에 d가 엄밀히 들어 있는지 (정확 산술)"""
+    rows = []
+    for px, py in (a, b, c):
+        dx, dy = px - d[0], py - d[1]
+        rows.append((dx, dy, dx * dx + dy * dy))
+    (a0, a1, a2), (b0, b1, b2), (c0, c1, c2) = rows
+    det = (a0 * (b1 * c2 - b2 * c1)
+           - a1 * (b0 * c2 - b2 * c0)
+           + a2 * (b0 * c1 - b1 * c0))
+    return det > 0
+
+def empty_circumcircles(coords: np.ndarray, triangles: np.ndarray) -> bool:
+    points = [(Fraction(x), Fraction(y)) for x, y in coords.tolist()]
+    for i, j, k in triangles.tolist():
+        for other, point in enumerate(points):
+            if other in (i, j, k):
+                continue
+            if strictly_inside_circumcircle(points[i], points[j], points[k], point):
+                return False
+    return True
+
+def twice_area(points) -> Fraction:
+    """다각형 넓이의 두 배 (신발끈 공식, 반시계 방향이면 양수)"""
+    total = Fraction(0)
+    for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+        total += ax * by - bx * ay
+    return total
+
+def exact_hull(points):
+    """중복을 제거한 점들의 엄밀한 볼록 껍질 꼭짓점 (정확 산술 모노톤 체인)"""
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    def half(sequence):
+        chain = []
+        for point in sequence:
+            while len(chain) >= 2 and cross(chain[-2], chain[-1], point) <= 0:
+                chain.pop()
+            chain.append(point)
+        return chain
+
+    unique = sorted(set(points))
+    if len(unique) < 3:
+        return unique
+    return half(unique)[:-1] + half(reversed(unique))[:-1]
+
+def covers_hull(coords: np.ndarray, triangles: np.ndarray) -> bool:
+    """삼각형 넓이의 합이 볼록 껍질 넓이와 같은지 (껍질 근처 삼각형 누락 확인)"""
+    points = [(Fraction(x), Fraction(y)) for x, y in coords.tolist()]
+    covered = sum((twice_area([points[v] for v in triangle]) for triangle in triangles.tolist()), Fraction(0))
+    return covered == twice_area(exact_hull(points))
+
+def brute_force_mst_weight(coords: np.ndarray) -> float:
+    n = len(coords)
+    matrix = np.sqrt(((coords[:, None, :] - coords[None, :, :]) ** 2).sum(axis=2))
+    in_tree = np.zeros(n, dtype=bool)
+    best = np.full(n, np.inf)
+    best[0] = 0.0
+    total = 0.0
+    for _ in range(n):
+        city = int(np.argmin(np.where(in_tree, np.inf, best)))
+        in_tree[city] = True
+        total += float(best[city])
+        best = np.minimum(best, matrix[city])
+    return total
+
+def edge_mst(coords: np.ndarray, edges: np.ndarray):
+    """들로네 간선만으로 크루스칼 MST (가중치, 연결 성분 수)"""
+    weights = np.hypot(*(coords[edges[:, 0]] - coords[edges[:, 1]]).T)
+    forest = UnionFind(len(coords))
+    total = 0.0
+    for index in np.argsort(weights, kind="stable").tolist():
+        if forest.union(int(edges[index, 0]), int(edges[index, 1])):
+            total += float(weights[index])
+    return total, forest.components
+
+def run_delaunay_check(n: int = 150) -> bool:
+    print("🔍 DELAUNAY CHECK (exact predicates vs brute force)")
+    print("=" * 52)
+    all_ok = True
+    for name, coords in sample_point_sets(n):
+        triangles = DelaunayTriangulation(coords).triangles()
+        edges = delaunay_edges(coords)
+        valid = empty_circumcircles(coords, triangles) and covers_hull(coords, triangles)
+        weight, components = edge_mst(coords, edges)
+        same_mst = bool(np.isclose(weight, brute_force_mst_weight(coords), rtol=1e-12, atol=1e-9))
+        connected = components == 1
+        ok = valid and same_mst and connected
+        all_ok = all_ok and ok
+        print(f"{'✅' if ok else '❌'} {name:<15} n={len(coords):<5} triangles={len(triangles):<5} "
+              f"delaunay={valid} mst={same_mst} connected={connected}")
+    return all_ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run_delaunay_check(int(sys.argv[1]) if len(sys.argv) > 1 else 150) else 1)
@@ -0,0 +1,73 @@
+"""
+Sparse MST Check
+kNN 후보 그래프가 여러 조각으로 나뉜 인스턴스에서, 조각을 이어 붙인 희소 MST의 무게가
+밀집 Prim의 MST 무게와 같은지 확인
+
+k가 작으면 멀리 떨어진 클러스터끼리는 후보 간선이 없어 그래프가 끊어진다.
+두 개의 큰 클러스터, 크기가 다른 여러 클러스터, 작은 클러스터가 많은 경우를
+평면 거리 타입(TSPLIB 반올림 포함)과 GEO에서 비교한다.
+
+실행: python experiments/check_mst.py [n]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.tsp_parser import TSPInstance
+from utils.candidates import build_candidates
+from utils.distance_matrix import build_distance_matrix
+from algorithms.mstapproximation import (connected_components, dense_prim_edges, mst_candidate_graph,
+                                         sparse_prim_edges)
+
+EDGE_WEIGHT_TYPES = [("EUC_2D", False), ("EUC_2D", True), ("CEIL_2D", False), ("ATT", False),
+                     ("MAN_2D", False), ("MAN_2D", True), ("MAX_2D", False), ("MAX_2D", True),
+                     ("GEO", False)]
+CANDIDATE_COUNT = 10
+
+def sample_point_sets(n: int):
+    rng = np.random.default_rng(0)
+    yield "two-clusters", np.concatenate([rng.normal(0, 50, (n // 2, 2)),
+                                          rng.normal(0, 50, (n - n // 2, 2)) + 5000])
+    sizes = [n // 2, n // 4, n // 8, n - n // 2 - n // 4 - n // 8]
+    centers = rng.random((len(sizes), 2)) * 20000
+    yield "uneven", np.concatenate([rng.normal(center, 30, (size, 2)) for center, size in zip(centers, sizes)])
+    centers = rng.random((n // 15, 2)) * 50000
+    yield "many-small", centers[np.minimum(np.arange(n) // 15, len(centers) - 1)] + rng.random((n, 2)) * 10
+
+def tree_weight(instance: TSPInstance, edges) -> float:
+    edges = np.asarray(edges, dtype=np.int64)
+    return float(np.sum(instance.oracle.pairs(edges[:, 0], edges[:, 1])))
+
+def run_mst_check(n: int = 1500) -> bool:
+    print("🌲 SPARSE MST CHECK (repaired kNN graph vs dense Prim)")
+    print("=" * 64)
+    all_same = True
+    for name, coords in sample_point_sets(n):
+        for edge_weight_type, rounding in EDGE_WEIGHT_TYPES:
+            if edge_weight_type == "GEO":
+                # DDD.MM 형식의 위도/경도 범위로 축소
+                coords = coords / np.abs(coords).max() * 80.0
+            matrix = build_distance_matrix(coords, edge_weight_type, tsplib_rounding=rounding)
+            instance = TSPInstance(name, coords, matrix, n, False, edge_weight_type, rounding)
+            build_candidates(instance, CANDIDATE_COUNT)
+            candidates = instance.candidates.astype(np.int64)
+            pieces = len(np.unique(connected_components(
+                n, np.repeat(np.arange(n), CANDIDATE_COUNT), candidates.ravel())))
+
+            first, second = mst_candidate_graph(instance, "candidates")
+            sparse_edges = sparse_prim_edges(n, first, second, instance.oracle.pairs(first, second))
+            sparse_weight = tree_weight(instance, sparse_edges)
+            dense_weight = tree_weight(instance, dense_prim_edges(instance))
+
+            same = len(sparse_edges) == n - 1 and np.isclose(sparse_weight, dense_weight, rtol=1e-12)
+            all_same = all_same and same
+            label = f"{edge_weight_type}{'+nint' if rounding else ''}"
+            print(f"{'✅' if same else '❌'} {name:<12} {label:<12} pieces={pieces:<5} "
+                  f"{sparse_weight:>14.1f} {dense_weight:>14.1f}")
+    return all_same
+
+if __name__ == "__main__":
+    sys.exit(0 if run_mst_check(int(sys.argv[1]) if len(sys.argv) > 1 else 1500) else 1)
@@ -3,7 +3,7 @@ Mona Lisa TSP Challenge - Simplified Execution
 모나리자 TSP (100K cities) 전용 실험 스크립트 (단순화 버전)
 
 실행: python test_monalisa.py
-예상 시간: 2-8시간
+예상 시간: 수십 초 (들로네 후보 그래프 위의 희소 MST)
 """
 
 import time
@@ -12,14 +12,14 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.tsp_parser import load_tsp_instances
-from algorithms.mst_approximation import solve_mst_approx
+from algorithms.mstapproximation import solve_mst_approx
 
 def run_monalisa_experiment():
     print("🎨 MONA LISA TSP CHALLENGE")
     print("=" * 50)
     print("Dataset: mona-lisa100K (100,000 cities)")
     print("Algorithm: MST 2-approximation")
-    print("Expected time: 2-8 hours")
+    print("Expected time: under a minute (sparse Delaunay MST)")
     print("=" * 50)
     
     # Load Mona Lisa dataset
@@ -0,0 +1,298 @@
+"""
+Candidate Neighbor Lists
+각 도시에서 고려할 가까운 이웃 후보를 미리 계산하는 유틸리티
+
+후보 목록은 (n, k) int32 배열이고, 행 i는 도시 i의 후보를 가까운 순서로 담는다
+(동점이면 인덱스가 작은 도시 먼저). 지역 탐색이나 MST 같은 알고리즘이 모든
+도시 대신 이 후보만 검사하면 O(n²) 대신 O(nk)로 동작한다.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List
+
+import numpy as np
+
+from utils.delaunay import delaunay_edges
+from utils.distance_matrix import default_block_size
+from utils.spatial_index import quadrant_of
+from utils.instance_cache import (
+    ensure_instance_cache, load_candidates_cache, save_candidates_cache
+)
+from utils.tsp_parser import TSPInstance
+
+# 기본 후보 수
+DEFAULT_CANDIDATE_COUNT = 10
+
+# 이 도시 수보다 크면 (평면 유클리드 거리일 때) 행 블록 대신 KD-트리로 계산
+KD_TREE_THRESHOLD = 20000
+
+def candidates_key(method: str, k: int, tsplib_rounding: bool = False) -> str:
+    """캐시 파일 이름에 쓰는 후보 목록 키 (예: "knn-10")"""
+    return f"{method}-{k}" + ("-nint" if tsplib_rounding else "")
+
+def build_candidates(instance: TSPInstance, k: int = DEFAULT_CANDIDATE_COUNT, method: str = "knn",
+                     cache: bool = False, cache_dir: str = None) -> np.ndarray:
+    """
+    후보 이웃 목록을 계산해 instance.candidates에 저장
+
+    Args:
+        instance: TSP 인스턴스
+        k: 도시당 후보 수 (n - 1보다 크면 n - 1)
+        method: "knn" (가장 가까운 k개) 또는 "quadrant" (사분면별 k/4개)
+        cache: True이면 원본 파일 옆 캐시 디렉토리에 저장하고 다음에는 메모리 매핑으로 읽음
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+
+    Returns:
+        np.ndarray: (n, k) int32 후보 배열
+    """
+    if method not in CANDIDATE_BUILDERS:
+        raise ValueError(f"Unsupported candidate method: {method}")
+    k = max(0, min(k, instance.dimension - 1))
+    key = candidates_key(method, k, instance.tsplib_rounding)
+    cache = cache and instance.source_path is not None
+
+    candidates = load_candidates_cache(instance.source_path, key, cache_dir) if cache else None
+    if candidates is None or candidates.shape != (instance.dimension, k):
+        candidates = CANDIDATE_BUILDERS[method](instance, k)
+        if cache and ensure_instance_cache(instance, cache_dir):
+            save_candidates_cache(instance.source_path, key, candidates, cache_dir)
+
+    instance.candidates = candidates
+    instance.candidate_method = method
+    return candidates
+
+def knn_candidates(instance: TSPInstance, k: int = DEFAULT_CANDIDATE_COUNT) -> np.ndarray:
+    """
+    각 도시에서 가장 가까운 k개 도시 (자기 자신 제외)
+
+    평면 유클리드 인스턴스가 크면 KD-트리 질의로, 그 밖에는 거리 행렬(또는 좌표)의
+    행 블록을 벡터화해 계산한다.
+
+    Args:
+        instance: TSP 인스턴스
+        k: 도시당 후보 수
+
+    Returns:
+        np.ndarray: (n, k) int32 후보 배열
+    """
+    n = instance.dimension
+    k = max(0, min(k, n - 1))
+    if (n > KD_TREE_THRESHOLD and instance.has_coordinates
+            and instance.edge_weight_type == "EUC_2D" and not instance.tsplib_rounding):
+        return _kd_tree_knn(instance, k)
+    return _block_knn(instance, k)
+
+def _block_knn(instance: TSPInstance, k: int) -> np.ndarray:
+    n = instance.dimension
+    result = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return result
+
+    oracle = instance.oracle
+    block_size = default_block_size(n)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = np.array(oracle.rows(start, stop), dtype=np.float64)
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = np.inf
+        result[start:stop] = smallest_per_row(block, k)
+
+    return result
+
+def smallest_per_row(block: np.ndarray, k: int) -> np.ndarray:
+    """
+    거리 블록의 각 행에서 가장 작은 k개 열 인덱스를 (거리, 인덱스) 순으로 반환
+
+    Args:
+        block: (m, n) float64 거리 블록 (제외할 칸은 inf)
+        k: 행마다 고를 개수 (1 <= k <= n)
+
+    Returns:
+        np.ndarray: (m, k) 열 인덱스 (inf 칸이 뽑힐 수 있으므로 호출한 쪽에서 확인)
+    """
+    result = np.empty((len(block), k), dtype=np.int64)
+
+    # k번째로 작은 값 이하인 칸만 남기고, 정확히 k개인 행은 한 번에 정렬
+    kth = np.partition(block, k - 1, axis=1)[:, k - 1:k]
+    mask = block <= kth
+    counts = mask.sum(axis=1)
+    exact = np.flatnonzero(counts == k)
+    selected = np.nonzero(mask[exact])[1].reshape(-1, k)  # 인덱스 오름차순
+    order = np.argsort(block[exact[:, np.newaxis], selected], axis=1, kind="stable")
+    result[exact] = np.take_along_axis(selected, order, axis=1)
+
+    # k번째 값에 동점이 있는 행: (거리, 인덱스) 순으로 k개 선택
+    for row in np.flatnonzero(counts != k).tolist():
+        cities = np.flatnonzero(mask[row])
+        result[row] = cities[np.lexsort((cities, block[row, cities]))[:k]]
+
+    return result
+
+def _kd_tree_knn(instance: TSPInstance, k: int) -> np.ndarray:
+    n = instance.dimension
+    result = np.empty((n, k), dtype=np.int32)
+    tree = instance.spatial_index("kdtree")
+    xs, ys = instance.coords[:, 0].tolist(), instance.coords[:, 1].tolist()
+    for city in range(n):
+        neighbors = tree.query(xs[city], ys[city], k + 1)
+        if city in neighbors:
+            neighbors.remove(city)
+        result[city] = neighbors[:k]
+    return result
+
+def quadrant_candidates(instance: TSPInstance, k: int = DEFAULT_CANDIDATE_COUNT) -> np.ndarray:
+    """
+    도시 주변 네 사분면에서 각각 가장 가까운 k/4개씩 고른 후보 (부족하면 가까운 도시로 채움)
+
+    클러스터가 뭉쳐 있는 인스턴스에서 kNN 후보가 한쪽 방향에만 몰리는 것을 막는다.
+    사분면은 도시 i 기준 (dx > 0, dy >= 0), (dx <= 0, dy > 0), (dx < 0, dy <= 0),
+    (dx >= 0, dy < 0)이고 같은 좌표의 도시는 첫 번째 사분면에 넣는다.
+    큰 평면 유클리드 인스턴스는 사분면마다 KD-트리 질의(query_quadrant)로 찾으며,
+    결과는 행 블록 경로와 같다 (experiments/check_candidates.py).
+
+    Args:
+        instance: 좌표가 있는 TSP 인스턴스
+        k: 도시당 후보 수
+
+    Returns:
+        np.ndarray: (n, k) int32 후보 배열 (행마다 가까운 순서)
+    """
+    if not instance.has_coordinates:
+        raise ValueError("Quadrant candidates require city coordinates")
+    n = instance.dimension
+    k = max(0, min(k, n - 1))
+    if (n > KD_TREE_THRESHOLD and instance.edge_weight_type == "EUC_2D"
+            and not instance.tsplib_rounding):
+        return _kd_tree_quadrants(instance, k)
+    return _block_quadrants(instance, k)
+
+def _block_quadrants(instance: TSPInstance, k: int) -> np.ndarray:
+    n = instance.dimension
+    result = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return result
+    per_quadrant = max(1, k // 4)
+    xs, ys = instance.coords[:, 0], instance.coords[:, 1]
+
+    oracle = instance.oracle
+    block_size = default_block_size(n)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = np.array(oracle.rows(start, stop), dtype=np.float64)
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = np.inf
+        labels = _quadrant_labels(xs[np.newaxis, :] - xs[start:stop, np.newaxis],
+                                  ys[np.newaxis, :] - ys[start:stop, np.newaxis])
+
+        nearest = smallest_per_row(block, k)
+        quadrant_best = [smallest_per_row(np.where(labels == quadrant, block, np.inf), per_quadrant)
+                         for quadrant in range(4)]
+        for row in rows.tolist():
+            chosen = [city for quadrant in range(4) for city in quadrant_best[quadrant][row].tolist()
+                      if labels[row, city] == quadrant and block[row, city] != np.inf]
+            chosen = np.array(chosen, dtype=np.int64)
+            chosen = chosen[np.lexsort((chosen, block[row, chosen]))][:k].tolist()
+            # 비어 있는 사분면 몫은 전체에서 가까운 도시로 채움
+            for city in nearest[row].tolist():
+                if len(chosen) == k:
+                    break
+                if city not in chosen:
+                    chosen.append(city)
+            chosen = np.array(chosen, dtype=np.int64)
+            result[start + row] = chosen[np.lexsort((chosen, block[row, chosen]))]
+
+    return result
+
+def _kd_tree_quadrants(instance: TSPInstance, k: int) -> np.ndarray:
+    # 블록 경로와 같은 선택: 사분면마다 KD-트리로 따로 찾으므로 먼 사분면의 이웃도 빠지지 않음
+    n = instance.dimension
+    result = np.empty((n, k), dtype=np.int64)
+    if k == 0:
+        return result.astype(np.int32)
+    per_quadrant = max(1, k // 4)
+    tree = instance.spatial_index("kdtree")
+    xs, ys = instance.coords[:, 0].tolist(), instance.coords[:, 1].tolist()
+
+    for city in range(n):
+        x, y = xs[city], ys[city]
+        # 가까운 4k개 안에서 사분면별 몫이 다 차면 그 사분면의 가장 가까운 점들이 맞으므로,
+        # 모자란 사분면(클러스터 가장자리 등)만 사분면 질의로 따로 찾음
+        neighbors = tree.query(x, y, min(4 * k + 1, n))
+        if city in neighbors:
+            neighbors.remove(city)
+        else:
+            neighbors.pop()
+        by_quadrant = [[] for _ in range(4)]
+        for neighbor in neighbors:
+            by_quadrant[quadrant_of(xs[neighbor] - x, ys[neighbor] - y)].append(neighbor)
+
+        chosen = []
+        for quadrant in range(4):
+            found = by_quadrant[quadrant]
+            if len(found) < per_quadrant and len(neighbors) < n - 1:
+                # 자기 자신은 사분면 0에 속하므로 하나 더 찾음
+                found = tree.query_quadrant(x, y, per_quadrant + (quadrant == 0), quadrant)
+                if city in found:
+                    found.remove(city)
+            chosen += found[:per_quadrant]
+        chosen = _sort_by_distance(instance, city, chosen)[:k]
+        for neighbor in neighbors[:k]:
+            if len(chosen) == k:
+                break
+            if neighbor not in chosen:
+                chosen.append(neighbor)
+        result[city] = chosen
+
+    # 행마다 (거리, 인덱스) 순으로 정렬
+    rows = np.repeat(np.arange(n), k)
+    distances = np.asarray(instance.oracle.pairs(rows, result.ravel()), dtype=np.float64)
+    order = np.lexsort((result.ravel(), distances, rows))
+    return result.ravel()[order].reshape(n, k).astype(np.int32)
+
+def _sort_by_distance(instance: TSPInstance, city: int, cities: List[int]) -> List[int]:
+    cities = np.array(cities, dtype=np.int64)
+    distances = instance.oracle.pairs(np.full(len(cities), city), cities)
+    return cities[np.lexsort((cities, distances))].tolist()
+
+def _quadrant_labels(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """상대 좌표 (dx, dy)의 사분면 번호 0~3"""
+    labels = np.full(dx.shape, 3, dtype=np.int8)
+    labels[(dx >= 0) & (dy >= 0)] = 0
+    labels[(dx <= 0) & (dy > 0)] = 1
+    labels[(dx < 0) & (dy <= 0)] = 2
+    return labels
+
+def delaunay_graph(instance: TSPInstance, cache: bool = False, cache_dir: str = None) -> np.ndarray:
+    """
+    들로네 삼각분할 간선으로 이루어진 희소 후보 그래프
+
+    평면 유클리드 인스턴스에서는 유클리드 MST를 항상 포함하고 좋은 투어의 간선도
+    대부분 포함한다. 간선 수는 3n 이하다.
+
+    Args:
+        instance: 좌표가 있는 TSP 인스턴스
+        cache: True이면 원본 파일 옆 캐시 디렉토리에 저장하고 다음에는 메모리 매핑으로 읽음
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+
+    Returns:
+        np.ndarray: (m, 2) int32 간선 배열 (i < j, 정렬됨)
+    """
+    if not instance.has_coordinates:
+        raise ValueError("Delaunay candidates require city coordinates")
+    cache = cache and instance.source_path is not None
+
+    edges = load_candidates_cache(instance.source_path, "delaunay", cache_dir) if cache else None
+    if edges is None:
+        edges = delaunay_edges(instance.coords)
+        if cache and ensure_instance_cache(instance, cache_dir):
+            save_candidates_cache(instance.source_path, "delaunay", edges, cache_dir)
+    return edges
+
+# method 이름 → 후보 계산 함수
+CANDIDATE_BUILDERS = {
+    "knn": knn_candidates,
+    "quadrant": quadrant_candidates,
+}
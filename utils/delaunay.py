@@ -0,0 +1,448 @@
+"""
+Delaunay Triangulation
+외부 기하 라이브러리 없이 평면 점 집합의 들로네 삼각분할을 계산하는 유틸리티
+
+점들을 힐베르트 곡선 순서로 하나씩 삽입하고(직전 삼각형에서 걷기로 위치를 찾음),
+삽입 후 로슨 뒤집기(Lawson flip)로 들로네 조건을 회복한다. 방향/외접원 판정은
+부동소수점 오차 한계를 넘으면 그대로 쓰고, 애매한 경우에만 Fraction으로 정확히
+다시 계산하므로 거의 동일선상이나 공원(cocircular)인 점들에서도 일관된 결과를 낸다.
+초기 삼각형의 꼭짓점은 무한히 먼 점으로 기호 처리하므로, 볼록 껍질 근처의 가는 삼각형이
+유한한 초기 삼각형 꼭짓점 때문에 뒤집혀 사라지는 일이 없다.
+
+유클리드 최소 신장 트리는 들로네 삼각분할의 부분 그래프이므로 반환되는
+O(n)개의 간선만으로 MST와 후보 기반 지역 탐색을 할 수 있다.
+"""
+
+import math
+from fractions import Fraction
+from typing import Tuple
+
+import numpy as np
+
+# Shewchuk의 적응형 판정식 1단계 오차 한계
+_ORIENT_ERROR_BOUND = 3.3306690738754716e-16
+_INCIRCLE_ERROR_BOUND = 1.1102230246251577e-15
+
+# 초기 삼각형 꼭짓점 n, n+1, n+2의 방향: 꼭짓점 = s * 방향 (s → ∞)
+_SUPER_DIRECTIONS = ((-1, -1), (1, -1), (0, 1))
+
+def hilbert_order(coords: np.ndarray, bits: int = 16) -> np.ndarray:
+    """
+    점들을 힐베르트 곡선 순서로 정렬한 인덱스 배열
+
+    Args:
+        coords: (n, 2) 좌표 배열
+        bits: 축마다 사용할 격자 비트 수
+
+    Returns:
+        np.ndarray: 정렬 순서 (동점이면 인덱스 순)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    low = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - low).max()), 1e-300)
+    side = (1 << bits) - 1
+    x = np.minimum(((coords[:, 0] - low[0]) / span * side).astype(np.int64), side)
+    y = np.minimum(((coords[:, 1] - low[1]) / span * side).astype(np.int64), side)
+
+    distance = np.zeros(len(coords), dtype=np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        # 사분면에 맞게 회전
+        flip = ~ry
+        mirror = flip & rx
+        x = np.where(mirror, side - x, x)
+        y = np.where(mirror, side - y, y)
+        x, y = np.where(flip, y, x), np.where(flip, x, y)
+        s >>= 1
+    return np.lexsort((np.arange(len(coords)), distance))
+
+def _orient_exact(ax, ay, bx, by, cx, cy) -> int:
+    ax, ay, bx, by, cx, cy = (Fraction(value) for value in (ax, ay, bx, by, cx, cy))
+    det = (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+    return (det > 0) - (det < 0)
+
+def _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy) -> int:
+    ax, ay, bx, by, cx, cy, dx, dy = (Fraction(value) for value in (ax, ay, bx, by, cx, cy, dx, dy))
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    det = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+           + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+           + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+    return (det > 0) - (det < 0)
+
+def _poly_mul(p, q):
+    result = [0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            result[i + j] += a * b
+    return result
+
+def _poly_add(p, q):
+    if len(p) < len(q):
+        p, q = q, p
+    return [a + (q[i] if i < len(q) else 0) for i, a in enumerate(p)]
+
+def _poly_sub(p, q):
+    return _poly_add(p, [-b for b in q])
+
+def _poly_sign(p) -> int:
+    """충분히 큰 s에서의 다항식 부호 (최고차 비영 계수의 부호)"""
+    for coefficient in reversed(p):
+        if coefficient:
+            return 1 if coefficient > 0 else -1
+    return 0
+
+def orient(ax, ay, bx, by, cx, cy) -> int:
+    """a, b, c가 반시계 방향이면 1, 시계 방향이면 -1, 동일선상이면 0"""
+    left = (ax - cx) * (by - cy)
+    right = (ay - cy) * (bx - cx)
+    det = left - right
+    if abs(det) > _ORIENT_ERROR_BOUND * (abs(left) + abs(right)):
+        return 1 if det > 0 else -1
+    return _orient_exact(ax, ay, bx, by, cx, cy)
+
+def incircle(ax, ay, bx, by, cx, cy, dx, dy) -> int:
+    """반시계 삼각형 abc의 외접원 안에 d가 있으면 1, 밖이면 -1, 원 위면 0"""
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    bc1, bc2 = bdx * cdy, cdx * bdy
+    ca1, ca2 = cdx * ady, adx * cdy
+    ab1, ab2 = adx * bdy, bdx * ady
+    det = alift * (bc1 - bc2) + blift * (ca1 - ca2) + clift * (ab1 - ab2)
+    permanent = (alift * (abs(bc1) + abs(bc2)) + blift * (abs(ca1) + abs(ca2))
+                 + clift * (abs(ab1) + abs(ab2)))
+    if abs(det) > _INCIRCLE_ERROR_BOUND * permanent:
+        return 1 if det > 0 else -1
+    return _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy)
+
+class DelaunayTriangulation:
+    """
+    점진적 삽입 + 로슨 뒤집기 들로네 삼각분할
+
+    삼각형 t의 꼭짓점은 vertices[3t:3t+3] (반시계 방향), vertices[3t+i]의 맞은편 변을
+    공유하는 이웃 삼각형은 neighbors[3t+i] (없으면 -1)에 담는 평탄한 리스트 구조다.
+    꼭짓점 n, n+1, n+2는 모든 점을 감싸는 초기 삼각형이며 결과에서는 제외된다. 이 꼭짓점은
+    s * _SUPER_DIRECTIONS (s → ∞)로 두고, 관련된 판정은 s에 대한 다항식의 부호로 정확히 계산한다.
+    같은 좌표의 점은 처음 삽입된 점으로 대표하고 duplicates에 (중복 점, 대표 점)으로 기록한다.
+    """
+
+    def __init__(self, coords: np.ndarray):
+        points = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+        self.dimension = n
+        self.coords = points
+        self.duplicates = []
+
+        self._xs = points[:, 0].tolist()
+        self._ys = points[:, 1].tolist()
+        self._integer_scale = None
+
+        self.vertices = [n, n + 1, n + 2]
+        self.neighbors = [-1, -1, -1]
+        self._last = 0
+
+        for point in hilbert_order(points).tolist() if n else []:
+            self._insert(point)
+
+    def _symbolic_point(self, vertex: int):
+        """
+        꼭짓점 좌표를 s에 대한 1차 다항식 쌍 ([상수, s 계수])으로 표현
+
+        부동소수점 좌표는 분모가 2의 거듭제곱인 유리수이므로, 가장 큰 분모를 곱해 정확한
+        정수로 바꾼다 (판정식은 동차식이라 같은 배율을 곱해도 부호가 변하지 않음).
+        """
+        if self._integer_scale is None:
+            self._integer_scale = max((value.as_integer_ratio()[1] for value in self._xs + self._ys),
+                                      default=1)
+        if vertex < self.dimension:
+            scale = self._integer_scale
+            x_numerator, x_denominator = self._xs[vertex].as_integer_ratio()
+            y_numerator, y_denominator = self._ys[vertex].as_integer_ratio()
+            return [x_numerator * (scale // x_denominator), 0], [y_numerator * (scale // y_denominator), 0]
+        ux, uy = _SUPER_DIRECTIONS[vertex - self.dimension]
+        return [0, ux], [0, uy]
+
+    def _orient_symbolic(self, a: int, b: int, c: int) -> int:
+        """초기 삼각형 꼭짓점이 섞인 orient 판정 (c는 실제 점)"""
+        n = self.dimension
+        if a >= n and b >= n:
+            # s² 항: 서로 다른 두 방향의 외적
+            ux, uy = _SUPER_DIRECTIONS[a - n]
+            wx, wy = _SUPER_DIRECTIONS[b - n]
+            return _poly_sign([ux * wy - uy * wx])
+        # s 항: 방향 성분이 -1, 0, 1이라 곱이 정확하므로 fsum의 부호가 정확한 부호
+        xs, ys = self._xs, self._ys
+        if a >= n:
+            ux, uy = _SUPER_DIRECTIONS[a - n]
+            lead = math.fsum((ux * ys[b], -ux * ys[c], -uy * xs[b], uy * xs[c]))
+        else:
+            ux, uy = _SUPER_DIRECTIONS[b - n]
+            lead = math.fsum((uy * xs[a], -uy * xs[c], -ux * ys[a], ux * ys[c]))
+        if lead:
+            return 1 if lead > 0 else -1
+        return self._orient_polynomial(a, b, c)
+
+    def _orient_polynomial(self, a: int, b: int, c: int) -> int:
+        (ax, ay), (bx, by), (cx, cy) = (self._symbolic_point(v) for v in (a, b, c))
+        det = _poly_sub(_poly_mul(_poly_sub(ax, cx), _poly_sub(by, cy)),
+                        _poly_mul(_poly_sub(ay, cy), _poly_sub(bx, cx)))
+        return _poly_sign(det)
+
+    def _incircle_symbolic(self, a: int, b: int, c: int, d: int) -> int:
+        """초기 삼각형 꼭짓점이 섞인 incircle 판정 (a는 실제 점, abc는 반시계 방향)"""
+        n = self.dimension
+        supers = (b >= n) + (c >= n) + (d >= n)
+        if supers == 1:
+            xs, ys = self._xs, self._ys
+            if d >= n:
+                # 실제 삼각형의 외접원은 유한하므로 무한히 먼 점은 항상 바깥
+                return -1
+            # 외접원이 반평면으로 수렴: s² 항의 부호는 나머지 두 꼭짓점과 d의 orient
+            first, second = (c, a) if b >= n else (a, b)
+            side = orient(xs[first], ys[first], xs[second], ys[second], xs[d], ys[d])
+            if side:
+                return side
+        return self._incircle_polynomial(a, b, c, d)
+
+    def _incircle_polynomial(self, a: int, b: int, c: int, d: int) -> int:
+        (ax, ay), (bx, by), (cx, cy), (dx, dy) = (self._symbolic_point(v) for v in (a, b, c, d))
+        adx, ady = _poly_sub(ax, dx), _poly_sub(ay, dy)
+        bdx, bdy = _poly_sub(bx, dx), _poly_sub(by, dy)
+        cdx, cdy = _poly_sub(cx, dx), _poly_sub(cy, dy)
+        alift = _poly_add(_poly_mul(adx, adx), _poly_mul(ady, ady))
+        blift = _poly_add(_poly_mul(bdx, bdx), _poly_mul(bdy, bdy))
+        clift = _poly_add(_poly_mul(cdx, cdx), _poly_mul(cdy, cdy))
+        det = _poly_add(_poly_add(
+            _poly_mul(alift, _poly_sub(_poly_mul(bdx, cdy), _poly_mul(cdx, bdy))),
+            _poly_mul(blift, _poly_sub(_poly_mul(cdx, ady), _poly_mul(adx, cdy)))),
+            _poly_mul(clift, _poly_sub(_poly_mul(adx, bdy), _poly_mul(bdx, ady))))
+        return _poly_sign(det)
+
+    def _locate(self, point: int) -> Tuple[int, int, int]:
+        """
+        점이 들어 있는 삼각형 찾기 (직전 삼각형에서 시작하는 가시성 걷기)
+
+        Returns:
+            (삼각형, 위치 종류, 인덱스): 종류 0 = 내부, 1 = 인덱스 맞은편 변 위, 2 = 꼭짓점과 일치
+        """
+        xs, ys, vertices, neighbors = self._xs, self._ys, self.vertices, self.neighbors
+        n = self.dimension
+        px, py = xs[point], ys[point]
+        triangle = self._last
+        while True:
+            base = 3 * triangle
+            zero = -1
+            zeros = 0
+            for i in range(3):
+                a = vertices[base + (i + 1) % 3]
+                b = vertices[base + (i + 2) % 3]
+                if a < n and b < n:
+                    side = orient(xs[a], ys[a], xs[b], ys[b], px, py)
+                else:
+                    side = self._orient_symbolic(a, b, point)
+                if side < 0:
+                    # 들로네 삼각분할에서는 가시성 걷기가 순환하지 않음
+                    triangle = neighbors[base + i]
+                    break
+                if side == 0:
+                    zeros += 1
+                    zero = i
+            else:
+                if zeros == 0:
+                    return triangle, 0, -1
+                if zeros == 1:
+                    return triangle, 1, zero
+                return triangle, 2, zero
+
+    def _replace_neighbor(self, triangle: int, old: int, new: int):
+        if triangle == -1:
+            return
+        neighbors = self.neighbors
+        base = 3 * triangle
+        for i in range(3):
+            if neighbors[base + i] == old:
+                neighbors[base + i] = new
+                return
+
+    def _set(self, triangle: int, a: int, b: int, c: int, na: int, nb: int, nc: int):
+        base = 3 * triangle
+        self.vertices[base:base + 3] = [a, b, c]
+        self.neighbors[base:base + 3] = [na, nb, nc]
+
+    def _new_triangle(self) -> int:
+        self.vertices.extend((-1, -1, -1))
+        self.neighbors.extend((-1, -1, -1))
+        return len(self.vertices) // 3 - 1
+
+    def _insert(self, point: int):
+        triangle, kind, index = self._locate(point)
+        vertices, neighbors = self.vertices, self.neighbors
+        base = 3 * triangle
+
+        if kind == 2:
+            # 같은 좌표의 꼭짓점이 이미 있음
+            xs, ys = self._xs, self._ys
+            for i in range(3):
+                vertex = vertices[base + i]
+                if vertex < self.dimension and xs[vertex] == xs[point] and ys[vertex] == ys[point]:
+                    self.duplicates.append((point, vertex))
+                    return
+
+        if kind == 0:
+            a, b, c = vertices[base:base + 3]
+            na, nb, nc = neighbors[base:base + 3]
+            t0, t1, t2 = triangle, self._new_triangle(), self._new_triangle()
+            self._set(t0, point, b, c, na, t1, t2)
+            self._set(t1, point, c, a, nb, t2, t0)
+            self._set(t2, point, a, b, nc, t0, t1)
+            self._replace_neighbor(nb, triangle, t1)
+            self._replace_neighbor(nc, triangle, t2)
+            stack = [t0, t1, t2]
+        else:
+            # 변 위의 점: 변을 공유하는 두 삼각형을 네 개로 나눔
+            a = vertices[base + index]
+            b = vertices[base + (index + 1) % 3]
+            c = vertices[base + (index + 2) % 3]
+            nb = neighbors[base + (index + 1) % 3]
+            nc = neighbors[base + (index + 2) % 3]
+            other = neighbors[base + index]
+            other_base = 3 * other
+            j = neighbors[other_base:other_base + 3].index(triangle)
+            d = vertices[other_base + j]
+            # other = (d, c, b) 순서
+            n_opposite_c = neighbors[other_base + (j + 1) % 3]
+            n_opposite_b = neighbors[other_base + (j + 2) % 3]
+
+            t1, t3 = triangle, other
+            t2, t4 = self._new_triangle(), self._new_triangle()
+            self._set(t1, point, a, b, nc, t3, t2)
+            self._set(t2, point, c, a, nb, t1, t4)
+            self._set(t3, point, b, d, n_opposite_c, t4, t1)
+            self._set(t4, point, d, c, n_opposite_b, t2, t3)
+            self._replace_neighbor(nb, triangle, t2)
+            self._replace_neighbor(n_opposite_b, other, t4)
+            stack = [t1, t2, t3, t4]
+
+        self._last = stack[0]
+        self._legalize(stack)
+
+    def _legalize(self, stack):
+        """새 점(각 삼각형의 0번 꼭짓점)의 맞은편 변이 들로네 조건을 만족할 때까지 뒤집기"""
+        xs, ys, vertices, neighbors = self._xs, self._ys, self.vertices, self.neighbors
+        n = self.dimension
+        while stack:
+            triangle = stack.pop()
+            base = 3 * triangle
+            other = neighbors[base]
+            if other == -1:
+                continue
+            point, a, b = vertices[base:base + 3]
+            other_base = 3 * other
+            j = neighbors[other_base:other_base + 3].index(triangle)
+            d = vertices[other_base + j]
+            if a < n and b < n and d < n:
+                inside = incircle(xs[point], ys[point], xs[a], ys[a], xs[b], ys[b], xs[d], ys[d])
+            else:
+                inside = self._incircle_symbolic(point, a, b, d)
+            if inside <= 0:
+                continue
+
+            # (point, a, b) + (d, b, a) -> (point, a, d) + (point, d, b)
+            n_other_b = neighbors[other_base + (j + 1) % 3]  # 변 a-d
+            n_other_a = neighbors[other_base + (j + 2) % 3]  # 변 d-b
+            n_a = neighbors[base + 1]  # 변 b-point
+            n_b = neighbors[base + 2]  # 변 point-a
+            self._set(triangle, point, a, d, n_other_b, other, n_b)
+            self._set(other, point, d, b, n_other_a, n_a, triangle)
+            self._replace_neighbor(n_other_b, other, triangle)
+            self._replace_neighbor(n_a, triangle, other)
+            stack.append(triangle)
+            stack.append(other)
+
+    def triangles(self) -> np.ndarray:
+        """초기 삼각형 꼭짓점을 포함하지 않는 (T, 3) 삼각형 배열 (반시계 방향)"""
+        triangles = np.array(self.vertices, dtype=np.int64).reshape(-1, 3)
+        return triangles[(triangles < self.dimension).all(axis=1)]
+
+    def edges(self) -> np.ndarray:
+        """
+        들로네 간선 목록 (i < j, 정렬됨)
+
+        초기 삼각형과 연결된 간선은 제외하고, 볼록 껍질 간선과 중복 좌표 간선
+        (중복 점 - 대표 점)을 더해 연결 그래프가 되도록 한다.
+        """
+        n = self.dimension
+        triangles = np.array(self.vertices, dtype=np.int64).reshape(-1, 3)
+        first = triangles.ravel()
+        second = triangles[:, [1, 2, 0]].ravel()
+        parts = [np.stack([first, second], axis=1)]
+        parts.append(convex_hull_edges(self.coords))
+        if self.duplicates:
+            parts.append(np.array(self.duplicates, dtype=np.int64))
+
+        pairs = np.concatenate(parts)
+        pairs = pairs[(pairs < n).all(axis=1) & (pairs[:, 0] != pairs[:, 1])]
+        low, high = pairs.min(axis=1), pairs.max(axis=1)
+        keys = np.unique(low * n + high)
+        return np.stack([keys // n, keys % n], axis=1).astype(np.int32)
+
+def convex_hull(coords: np.ndarray) -> np.ndarray:
+    """
+    모노톤 체인으로 볼록 껍질 위의 점 인덱스를 반시계 방향으로 반환
+
+    껍질 변 위의 동일선상 점도 순서대로 포함한다 (모든 점이 한 직선 위에 있으면
+    왕복 순서가 되므로 연속한 쌍은 같은 간선이 두 번씩 나온다). 같은 좌표의 점은
+    인덱스가 가장 작은 점 하나만 포함한다.
+    """
+    points = np.asarray(coords, dtype=np.float64)
+    order = np.lexsort((np.arange(len(points)), points[:, 1], points[:, 0]))
+    # 같은 좌표는 인덱스가 가장 작은 점만 남김 (중복 점끼리는 orient가 0이라 체인에서 빠지지 않음)
+    if len(order) > 1:
+        ordered = points[order]
+        order = order[np.concatenate([[True], (ordered[1:] != ordered[:-1]).any(axis=1)])]
+    order = order.tolist()
+    xs, ys = points[:, 0].tolist(), points[:, 1].tolist()
+    if len(order) < 3:
+        return np.array(order, dtype=np.int64)
+
+    def half(sequence):
+        chain = []
+        for point in sequence:
+            while len(chain) >= 2 and orient(xs[chain[-2]], ys[chain[-2]], xs[chain[-1]], ys[chain[-1]],
+                                             xs[point], ys[point]) < 0:
+                chain.pop()
+            chain.append(point)
+        return chain
+
+    lower = half(order)
+    upper = half(reversed(order))
+    return np.array(lower[:-1] + upper[:-1], dtype=np.int64)
+
+def convex_hull_edges(coords: np.ndarray) -> np.ndarray:
+    """볼록 껍질 위의 연속한 점 쌍 (껍질 변 위의 동일선상 점도 순서대로 연결)"""
+    hull = convex_hull(coords)
+    if len(hull) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.stack([hull, np.roll(hull, -1)], axis=1)
+
+def delaunay_edges(coords: np.ndarray) -> np.ndarray:
+    """
+    좌표 배열의 들로네 간선 목록
+
+    Args:
+        coords: (n, 2) 좌표 배열
+
+    Returns:
+        np.ndarray: (m, 2) int32 간선 배열 (i < j, m = O(n))
+    """
+    if len(coords) < 2:
+        return np.empty((0, 2), dtype=np.int32)
+    return DelaunayTriangulation(coords).edges()
@@ -0,0 +1,532 @@
+"""
+Vectorized Distance Matrix Builder
+좌표 배열로부터 거리 행렬을 NumPy 브로드캐스팅으로 계산하는 유틸리티
+"""
+
+import os
+import math
+
+import numpy as np
+
+# 블록 하나를 계산할 때 허용하는 임시 배열 크기 (바이트)
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+# 지원하는 TSPLIB EDGE_WEIGHT_TYPE (그 밖의 타입은 EUC_2D로 계산)
+SUPPORTED_EDGE_WEIGHT_TYPES = ("EUC_2D", "MAN_2D", "MAX_2D", "CEIL_2D", "ATT", "GEO")
+
+# 정의 자체가 정수 거리인 타입 (tsplib_rounding 설정과 관계없이 정수 값)
+INTEGER_EDGE_WEIGHT_TYPES = ("CEIL_2D", "ATT", "GEO")
+
+# TSPLIB GEO 거리 상수
+GEO_PI = 3.141592
+GEO_EARTH_RADIUS = 6378.388
+
+def nint(values):
+    """TSPLIB nint: (int)(x + 0.5)"""
+    return np.floor(values + 0.5)
+
+def geo_radians(coords: np.ndarray) -> np.ndarray:
+    """GEO 좌표(DDD.MM 형식의 위도, 경도)를 라디안으로 변환"""
+    degrees = np.trunc(coords)
+    minutes = coords - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+def prepare_coordinates(coords: np.ndarray, edge_weight_type: str = "EUC_2D") -> np.ndarray:
+    """거리 커널에 넘길 좌표 준비 (GEO는 라디안 위경도, 나머지는 그대로)"""
+    if edge_weight_type == "GEO":
+        return geo_radians(coords)
+    return coords
+
+def distance_kernel(xa, ya, xb, yb, edge_weight_type: str = "EUC_2D",
+                    tsplib_rounding: bool = False) -> np.ndarray:
+    """
+    브로드캐스트 가능한 좌표 성분 배열로부터 TSPLIB 거리 계산
+
+    행렬 블록((m, 1)과 (1, k))과 도시 쌍 목록((m,)과 (m,)) 모두에 사용한다.
+    GEO는 prepare_coordinates로 변환한 라디안 좌표를 받는다.
+
+    Args:
+        xa, ya: 첫 번째 점들의 x, y 성분
+        xb, yb: 두 번째 점들의 x, y 성분
+        edge_weight_type: 거리 계산 방법
+        tsplib_rounding: True이면 EUC_2D, MAN_2D, MAX_2D에 TSPLIB nint 반올림 적용
+
+    Returns:
+        np.ndarray: float64 거리 배열
+    """
+    if edge_weight_type == "GEO":
+        # x = 위도, y = 경도
+        q1 = np.cos(ya - yb)
+        q2 = np.cos(xa - xb)
+        q3 = np.cos(xa + xb)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.floor(GEO_EARTH_RADIUS * np.arccos(cosine) + 1.0)
+
+    dx = xa - xb
+    dy = ya - yb
+
+    if edge_weight_type == "MAN_2D":
+        np.abs(dx, out=dx)
+        np.abs(dy, out=dy)
+        dx += dy
+        return nint(dx) if tsplib_rounding else dx
+
+    if edge_weight_type == "MAX_2D":
+        np.abs(dx, out=dx)
+        np.abs(dy, out=dy)
+        if tsplib_rounding:
+            return np.maximum(nint(dx), nint(dy))
+        return np.maximum(dx, dy, out=dx)
+
+    # 유클리드 계열 (math.sqrt 기반 계산과 비트 단위로 동일)
+    dx *= dx
+    dy *= dy
+    dx += dy
+
+    if edge_weight_type == "ATT":
+        dx /= 10.0
+        np.sqrt(dx, out=dx)
+        rounded = nint(dx)
+        return np.where(rounded < dx, rounded + 1.0, rounded)
+
+    np.sqrt(dx, out=dx)
+    if edge_weight_type == "CEIL_2D":
+        return np.ceil(dx, out=dx)
+    return nint(dx) if tsplib_rounding else dx
+
+def pairwise_distances(coords_a: np.ndarray, coords_b: np.ndarray,
+                       edge_weight_type: str = "EUC_2D",
+                       tsplib_rounding: bool = False) -> np.ndarray:
+    """
+    coords_a의 각 점과 coords_b의 각 점 사이의 거리를 계산
+
+    Args:
+        coords_a: (m, 2) 좌표 배열
+        coords_b: (k, 2) 좌표 배열
+        edge_weight_type: 거리 계산 방법
+        tsplib_rounding: TSPLIB nint 반올림 적용 여부
+
+    Returns:
+        np.ndarray: (m, k) 거리 배열
+    """
+    coords_a = prepare_coordinates(coords_a, edge_weight_type)
+    coords_b = prepare_coordinates(coords_b, edge_weight_type)
+    return distance_kernel(coords_a[:, 0, np.newaxis], coords_a[:, 1, np.newaxis],
+                           coords_b[np.newaxis, :, 0], coords_b[np.newaxis, :, 1],
+                           edge_weight_type, tsplib_rounding)
+
+def pair_distances(coords: np.ndarray, cities_a, cities_b,
+                   edge_weight_type: str = "EUC_2D",
+                   tsplib_rounding: bool = False) -> np.ndarray:
+    """
+    좌표로부터 (cities_a[k], cities_b[k]) 쌍들의 거리를 한 번에 계산
+
+    Args:
+        coords: (n, 2) 좌표 배열
+        cities_a, cities_b: 같은 길이의 도시 인덱스 배열
+        edge_weight_type: 거리 계산 방법
+        tsplib_rounding: TSPLIB nint 반올림 적용 여부
+
+    Returns:
+        np.ndarray: 거리 배열 (같은 도시 쌍은 0)
+    """
+    cities_a = np.asarray(cities_a, dtype=np.intp)
+    cities_b = np.asarray(cities_b, dtype=np.intp)
+    points_a = prepare_coordinates(coords[cities_a], edge_weight_type)
+    points_b = prepare_coordinates(coords[cities_b], edge_weight_type)
+    result = distance_kernel(points_a[:, 0], points_a[:, 1], points_b[:, 0], points_b[:, 1],
+                             edge_weight_type, tsplib_rounding)
+    if edge_weight_type == "GEO":
+        # TSPLIB GEO 공식은 같은 점 사이에도 1을 주므로 0으로 보정
+        result[cities_a == cities_b] = 0.0
+    return result
+
+def scalar_distance_function(edge_weight_type: str = "EUC_2D", tsplib_rounding: bool = False):
+    """
+    두 좌표 튜플 사이의 거리를 계산하는 스칼라 함수 반환 (실시간 단건 조회용)
+
+    distance_kernel과 같은 공식을 math 함수로 계산하므로 결과가 같다.
+    """
+    if edge_weight_type == "GEO":
+        def geo_distance(coord1, coord2):
+            lat1, lon1 = _geo_scalar(coord1)
+            lat2, lon2 = _geo_scalar(coord2)
+            q1 = math.cos(lon1 - lon2)
+            q2 = math.cos(lat1 - lat2)
+            q3 = math.cos(lat1 + lat2)
+            cosine = min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+            return float(math.floor(GEO_EARTH_RADIUS * math.acos(cosine) + 1.0))
+        return geo_distance
+
+    if edge_weight_type == "MAN_2D":
+        def manhattan(coord1, coord2):
+            distance = abs(coord1[0] - coord2[0]) + abs(coord1[1] - coord2[1])
+            return float(math.floor(distance + 0.5)) if tsplib_rounding else distance
+        return manhattan
+
+    if edge_weight_type == "MAX_2D":
+        def maximum(coord1, coord2):
+            dx = abs(coord1[0] - coord2[0])
+            dy = abs(coord1[1] - coord2[1])
+            if tsplib_rounding:
+                return float(max(math.floor(dx + 0.5), math.floor(dy + 0.5)))
+            return max(dx, dy)
+        return maximum
+
+    def euclidean(coord1, coord2):
+        dx = coord1[0] - coord2[0]
+        dy = coord1[1] - coord2[1]
+        squared = dx * dx + dy * dy
+        if edge_weight_type == "ATT":
+            distance = math.sqrt(squared / 10.0)
+            rounded = float(math.floor(distance + 0.5))
+            return rounded + 1.0 if rounded < distance else rounded
+        distance = math.sqrt(squared)
+        if edge_weight_type == "CEIL_2D":
+            return float(math.ceil(distance))
+        return float(math.floor(distance + 0.5)) if tsplib_rounding else distance
+    return euclidean
+
+def _geo_scalar(coord):
+    """GEO 좌표 하나를 (위도, 경도) 라디안으로 변환"""
+    result = []
+    for value in coord:
+        degrees = float(math.trunc(value))
+        result.append(GEO_PI * (degrees + 5.0 * (value - degrees) / 3.0) / 180.0)
+    return result
+
+# parse_tsp_file 등에서 지정할 수 있는 거리 값 저장 형식
+DISTANCE_DTYPES = {
+    "float64": np.float64,
+    "float32": np.float32,
+    "int32": np.int32,  # TSPLIB nint 규칙으로 반올림한 정수 거리
+}
+
+def distance_dtype(dtype: str) -> type:
+    """저장 형식 이름을 NumPy dtype으로 변환"""
+    if dtype not in DISTANCE_DTYPES:
+        raise ValueError(f"Unsupported distance dtype: {dtype}")
+    return DISTANCE_DTYPES[dtype]
+
+def convert_distances(values: np.ndarray, dtype: str = "float64") -> np.ndarray:
+    """
+    계산된 float64 거리 배열을 저장 형식(dtype)으로 변환
+
+    Args:
+        values: float64 거리 배열
+        dtype: "float64", "float32", "int32" 중 하나
+
+    Returns:
+        np.ndarray: 변환된 배열 (int32는 TSPLIB nint = floor(d + 0.5))
+    """
+    if dtype == "int32":
+        return np.floor(values + 0.5).astype(np.int32)
+    return values.astype(distance_dtype(dtype), copy=False)
+
+def default_block_size(n: int, block_bytes: int = DEFAULT_BLOCK_BYTES) -> int:
+    """행 블록 하나의 임시 배열(dx, dy)이 block_bytes를 넘지 않도록 하는 행 수"""
+    return max(1, block_bytes // (2 * 8 * max(n, 1)))
+
+def build_distance_matrix(coords: np.ndarray, edge_weight_type: str = "EUC_2D",
+                          block_size: int = None, dtype: str = "float64",
+                          tsplib_rounding: bool = False) -> np.ndarray:
+    """
+    좌표 배열로부터 (n, n) 거리 행렬을 행 블록 단위로 계산
+
+    Args:
+        coords: (n, 2) 좌표 배열
+        edge_weight_type: 거리 계산 방법
+        block_size: 한 번에 계산할 행 수 (None이면 메모리 한도로 자동 결정)
+        dtype: 저장 형식 ("float64", "float32", "int32")
+        tsplib_rounding: TSPLIB nint 반올림 적용 여부
+
+    Returns:
+        np.ndarray: (n, n) 거리 행렬
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    n = len(coords)
+    if block_size is None:
+        block_size = default_block_size(n)
+
+    matrix = np.empty((n, n), dtype=distance_dtype(dtype))
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        matrix[start:stop] = convert_distances(
+            pairwise_distances(coords[start:stop], coords, edge_weight_type, tsplib_rounding), dtype)
+    # 대각선은 항상 0 (TSPLIB GEO 공식은 같은 점에 1을 줌)
+    np.fill_diagonal(matrix, 0)
+
+    return matrix
+
+def condensed_size(n: int) -> int:
+    """n개 도시의 상삼각(i < j) 원소 개수 n(n-1)/2"""
+    return n * (n - 1) // 2
+
+def condensed_row_offsets(n: int) -> np.ndarray:
+    """각 행 i의 (i, i+1) 원소가 시작되는 condensed 인덱스 배열"""
+    rows = np.arange(n, dtype=np.int64)
+    return rows * (2 * n - rows - 1) // 2
+
+class CondensedDistanceMatrix:
+    """
+    대칭 거리 행렬의 상삼각 부분(i < j)만 1차원 배열로 보관하는 클래스
+
+    (i, j) 원소(i < j)는 i * (2n - i - 1) / 2 + (j - i - 1) 위치에 저장되므로
+    조회는 O(1)이고, 메모리는 밀집 행렬의 절반 (float32/int32면 1/4)이다.
+    """
+
+    def __init__(self, values: np.ndarray, dimension: int):
+        if len(values) != condensed_size(dimension):
+            raise ValueError(f"Condensed matrix size mismatch: {len(values)} != {condensed_size(dimension)}")
+        self.values = values
+        self.dimension = dimension
+        self.dtype = values.dtype
+        self._row_offsets = condensed_row_offsets(dimension)
+
+    def __len__(self) -> int:
+        return self.dimension
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def index(self, i: int, j: int) -> int:
+        """(i, j) 원소의 condensed 인덱스 (i != j)"""
+        if i > j:
+            i, j = j, i
+        return i * (2 * self.dimension - i - 1) // 2 + j - i - 1
+
+    def get(self, i: int, j: int) -> float:
+        """두 도시 간 거리 반환 (파이썬 float)"""
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return float(self.values[i * (2 * self.dimension - i - 1) // 2 + j - i - 1])
+
+    def row(self, i: int) -> np.ndarray:
+        """도시 i에서 모든 도시까지의 거리 배열 반환"""
+        n = self.dimension
+        result = np.empty(n, dtype=self.values.dtype)
+        # j < i: 각 행 j의 (j, i) 위치, j > i: 행 i의 연속 구간
+        lower = np.arange(i)
+        result[:i] = self.values[self._row_offsets[:i] + (i - lower - 1)]
+        result[i] = 0
+        start = self._row_offsets[i]
+        result[i + 1:] = self.values[start:start + n - i - 1]
+        return result
+
+    def pairs(self, cities_a, cities_b) -> np.ndarray:
+        """(cities_a[k], cities_b[k]) 쌍들의 거리를 한 번에 조회"""
+        cities_a = np.asarray(cities_a, dtype=np.int64)
+        cities_b = np.asarray(cities_b, dtype=np.int64)
+        low = np.minimum(cities_a, cities_b)
+        high = np.maximum(cities_a, cities_b)
+        same = low == high
+        index = self._row_offsets[low] + (high - low - 1)
+        index[same] = 0
+        result = self.values[index]
+        result[same] = 0
+        return result
+
+    def to_dense(self) -> np.ndarray:
+        """(n, n) 밀집 행렬로 펼치기"""
+        n = self.dimension
+        dense = np.zeros((n, n), dtype=self.values.dtype)
+        upper_i, upper_j = np.triu_indices(n, k=1)
+        dense[upper_i, upper_j] = self.values
+        dense[upper_j, upper_i] = self.values
+        return dense
+
+def build_condensed_matrix(coords: np.ndarray, edge_weight_type: str = "EUC_2D",
+                           dtype: str = "float64", block_size: int = None,
+                           out: np.ndarray = None,
+                           tsplib_rounding: bool = False) -> CondensedDistanceMatrix:
+    """
+    좌표 배열로부터 상삼각 condensed 거리 행렬을 행 블록 단위로 계산
+
+    Args:
+        coords: (n, 2) 좌표 배열
+        edge_weight_type: 거리 계산 방법
+        dtype: 저장 형식 ("float64", "float32", "int32")
+        block_size: 한 번에 계산할 행 수 (None이면 메모리 한도로 자동 결정)
+        out: 결과를 기록할 길이 n(n-1)/2 배열 (None이면 새로 할당)
+        tsplib_rounding: TSPLIB nint 반올림 적용 여부
+
+    Returns:
+        CondensedDistanceMatrix: condensed 거리 행렬
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+    n = len(coords)
+    if block_size is None:
+        block_size = default_block_size(n)
+    if out is None:
+        out = np.empty(condensed_size(n), dtype=distance_dtype(dtype))
+
+    offsets = condensed_row_offsets(n)
+    for start in range(0, n - 1, block_size):
+        stop = min(start + block_size, n - 1)
+        # 블록의 행들과 그 오른쪽 열들 사이 거리만 계산
+        block = convert_distances(
+            pairwise_distances(coords[start:stop], coords[start + 1:], edge_weight_type, tsplib_rounding), dtype)
+        for i in range(start, stop):
+            out[offsets[i]:offsets[i] + n - i - 1] = block[i - start, i - start:]
+
+    return CondensedDistanceMatrix(out, n)
+
+def build_memmap_matrix(coords: np.ndarray, path: str, edge_weight_type: str = "EUC_2D",
+                        dtype: str = "float32", block_size: int = None,
+                        tsplib_rounding: bool = False) -> CondensedDistanceMatrix:
+    """
+    condensed 거리 행렬을 디스크의 .npy 파일에 행 블록 단위로 기록한 뒤 메모리 매핑으로 연결
+
+    전체 행렬을 메모리에 올리지 않으므로 RAM보다 큰 행렬도 만들 수 있고,
+    이후 조회는 OS 페이지 캐시가 담당한다.
+
+    Args:
+        coords: (n, 2) 좌표 배열
+        path: 저장할 .npy 파일 경로
+        edge_weight_type: 거리 계산 방법
+        dtype: 저장 형식 ("float32", "int32", "float64")
+        block_size: 한 번에 계산할 행 수 (None이면 메모리 한도로 자동 결정)
+        tsplib_rounding: TSPLIB nint 반올림 적용 여부
+
+    Returns:
+        CondensedDistanceMatrix: 읽기 전용 메모리 매핑 condensed 행렬
+    """
+    n = len(coords)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    values = np.lib.format.open_memmap(temp_path, mode="w+", dtype=distance_dtype(dtype),
+                                       shape=(condensed_size(n),))
+    build_condensed_matrix(coords, edge_weight_type, dtype, block_size, out=values,
+                           tsplib_rounding=tsplib_rounding)
+    values.flush()
+    del values
+    os.replace(temp_path, path)
+    return open_memmap_matrix(path, n)
+
+def open_memmap_matrix(path: str, dimension: int) -> CondensedDistanceMatrix:
+    """디스크의 condensed 거리 행렬 .npy 파일을 읽기 전용 메모리 매핑으로 열기"""
+    return CondensedDistanceMatrix(np.load(path, mmap_mode="r"), dimension)
+
+# EDGE_WEIGHT_FORMAT → 같은 순서로 값을 나열하는 행 단위 형식
+# (상삼각을 열 단위로 나열하는 것은 하삼각을 행 단위로 나열하는 것과 같은 순서)
+EXPLICIT_ROW_FORMATS = {
+    "FULL_MATRIX": "FULL_MATRIX",
+    "UPPER_ROW": "UPPER_ROW",
+    "LOWER_ROW": "LOWER_ROW",
+    "UPPER_DIAG_ROW": "UPPER_DIAG_ROW",
+    "LOWER_DIAG_ROW": "LOWER_DIAG_ROW",
+    "UPPER_COL": "LOWER_ROW",
+    "LOWER_COL": "UPPER_ROW",
+    "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+    "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+}
+
+class ExplicitMatrixBuilder:
+    """
+    EDGE_WEIGHT_SECTION의 숫자들을 순서대로 받아 거리 행렬을 채우는 클래스
+
+    값은 feed()로 여러 번에 나누어 넣을 수 있고, 한 행 분량이 모일 때마다
+    바로 condensed(또는 밀집) 배열에 기록하므로 전체 값을 리스트로 모아 둘 필요가 없다.
+    FULL_MATRIX를 condensed로 저장할 때는 상삼각(i < j) 값만 사용한다.
+    """
+
+    def __init__(self, dimension: int, edge_weight_format: str, storage: str = "condensed",
+                 dtype: str = "float64", out: np.ndarray = None):
+        if edge_weight_format not in EXPLICIT_ROW_FORMATS:
+            raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format}")
+        self.dimension = dimension
+        self.row_format = EXPLICIT_ROW_FORMATS[edge_weight_format]
+        self.storage = storage
+        self.dtype = dtype
+
+        n = dimension
+        if storage == "dense":
+            self.values = np.zeros((n, n), dtype=distance_dtype(dtype)) if out is None else out
+        else:
+            self.values = np.empty(condensed_size(n), dtype=distance_dtype(dtype)) if out is None else out
+        self._row_offsets = condensed_row_offsets(n)
+
+        # 각 형식의 첫 행 번호와 행 수
+        if self.row_format == "UPPER_ROW":
+            self.row, self.last_row = 0, n - 2
+        elif self.row_format == "LOWER_ROW":
+            self.row, self.last_row = 1, n - 1
+        else:
+            self.row, self.last_row = 0, n - 1
+        self._pending = np.empty(0, dtype=np.float64)
+
+    def row_length(self, i: int) -> int:
+        """i번째 행에 나열되는 값의 개수"""
+        n = self.dimension
+        return {
+            "FULL_MATRIX": n,
+            "UPPER_ROW": n - 1 - i,
+            "LOWER_ROW": i,
+            "UPPER_DIAG_ROW": n - i,
+            "LOWER_DIAG_ROW": i + 1,
+        }[self.row_format]
+
+    @property
+    def complete(self) -> bool:
+        return self.row > self.last_row
+
+    def feed(self, numbers: np.ndarray):
+        """다음 숫자들을 추가 (완성된 행은 즉시 기록)"""
+        if len(self._pending):
+            numbers = np.concatenate([self._pending, numbers])
+        position = 0
+        while not self.complete:
+            length = self.row_length(self.row)
+            if position + length > len(numbers):
+                break
+            self._write_row(self.row, convert_distances(numbers[position:position + length], self.dtype))
+            position += length
+            self.row += 1
+        if self.complete and position < len(numbers):
+            raise ValueError("EDGE_WEIGHT_SECTION has more values than DIMENSION allows")
+        self._pending = numbers[position:].copy()
+
+    def finish(self):
+        """모든 행이 채워졌는지 확인하고 행렬 반환 (condensed면 CondensedDistanceMatrix)"""
+        if not self.complete:
+            raise ValueError("EDGE_WEIGHT_SECTION has fewer values than DIMENSION requires")
+        if self.storage == "dense":
+            np.fill_diagonal(self.values, 0)
+            return self.values
+        return CondensedDistanceMatrix(self.values, self.dimension)
+
+    def _write_row(self, i: int, segment: np.ndarray):
+        n = self.dimension
+        row_format = self.row_format
+
+        if self.storage == "dense":
+            matrix = self.values
+            if row_format == "FULL_MATRIX":
+                matrix[i] = segment
+            elif row_format == "UPPER_ROW":
+                matrix[i, i + 1:] = segment
+                matrix[i + 1:, i] = segment
+            elif row_format == "UPPER_DIAG_ROW":
+                matrix[i, i:] = segment
+                matrix[i:, i] = segment
+            elif row_format == "LOWER_ROW":
+                matrix[i, :i] = segment
+                matrix[:i, i] = segment
+            else:
+                matrix[i, :i + 1] = segment
+                matrix[:i + 1, i] = segment
+            return
+
+        # condensed: 행 i의 (i, j > i) 값은 연속 구간, (j < i, i) 값은 각 행 j에 흩어져 있음
+        start = self._row_offsets[i]
+        if row_format == "FULL_MATRIX":
+            self.values[start:start + n - i - 1] = segment[i + 1:]
+        elif row_format == "UPPER_ROW":
+            self.values[start:start + n - i - 1] = segment
+        elif row_format == "UPPER_DIAG_ROW":
+            self.values[start:start + n - i - 1] = segment[1:]
+        else:
+            lower = np.arange(i)
+            self.values[self._row_offsets[:i] + (i - lower - 1)] = segment[:i]
@@ -0,0 +1,204 @@
+"""
+Distance Oracles
+TSPInstance의 거리 저장 방식(밀집, condensed, 메모리 매핑, 실시간 계산)을
+같은 인터페이스로 감싸는 거리 조회 클래스들
+
+솔버는 조회할 때마다 저장 방식을 분기하지 않고 `instance.oracle`을 한 번 받아
+get(i, j), row(i), pairs(a, b)를 호출한다. row와 pairs는 여러 거리를 한 번에
+NumPy 배열로 돌려주므로 벡터화된 루프에 그대로 쓸 수 있다.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+from utils.distance_matrix import (
+    CondensedDistanceMatrix, pair_distances, pairwise_distances, scalar_distance_function
+)
+
+class DistanceOracle:
+    """거리 조회 인터페이스 (하위 클래스가 get, row, pairs를 구현)"""
+
+    kind = "base"
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def __len__(self) -> int:
+        return self.dimension
+
+    @property
+    def nbytes(self) -> int:
+        """거리 값을 보관하는 데 쓰는 메모리 (바이트)"""
+        return 0
+
+    def get(self, i: int, j: int):
+        """두 도시 간 거리"""
+        raise NotImplementedError
+
+    def row(self, i: int) -> np.ndarray:
+        """도시 i에서 모든 도시까지의 거리 배열"""
+        raise NotImplementedError
+
+    def pairs(self, cities_a, cities_b) -> np.ndarray:
+        """(cities_a[k], cities_b[k]) 쌍들의 거리 배열"""
+        raise NotImplementedError
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """도시 start..stop-1 각각에서 모든 도시까지의 (stop - start, n) 거리 블록"""
+        return np.stack([self.row(i) for i in range(start, stop)])
+
+class DenseOracle(DistanceOracle):
+    """(n, n) 밀집 행렬 조회"""
+
+    kind = "dense"
+
+    def __init__(self, matrix: np.ndarray):
+        super().__init__(len(matrix))
+        self.matrix = matrix
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    def get(self, i: int, j: int) -> float:
+        return float(self.matrix[i, j])
+
+    def row(self, i: int) -> np.ndarray:
+        return self.matrix[i]
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        return self.matrix[start:stop]
+
+    def pairs(self, cities_a, cities_b) -> np.ndarray:
+        cities_a = np.asarray(cities_a, dtype=np.intp)
+        cities_b = np.asarray(cities_b, dtype=np.intp)
+        return self.matrix[cities_a, cities_b]
+
+class CondensedOracle(DistanceOracle):
+    """상삼각 condensed 행렬 조회 (메모리 매핑된 행렬이면 kind가 "memmap")"""
+
+    def __init__(self, matrix: CondensedDistanceMatrix):
+        super().__init__(matrix.dimension)
+        self.matrix = matrix
+        self.kind = "memmap" if isinstance(matrix.values, np.memmap) else "condensed"
+        # 메서드 위임 단계를 줄이기 위해 바로 연결
+        self.get = matrix.get
+        self.row = matrix.row
+        self.pairs = matrix.pairs
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+class CoordinateOracle(DistanceOracle):
+    """거리 행렬 없이 좌표로부터 실시간 계산 (대용량 인스턴스용)"""
+
+    kind = "coordinates"
+
+    def __init__(self, coords: np.ndarray, edge_weight_type: str = "EUC_2D",
+                 tsplib_rounding: bool = False):
+        super().__init__(len(coords))
+        self.coords = coords
+        self.edge_weight_type = edge_weight_type
+        self.tsplib_rounding = tsplib_rounding
+        self._points = [tuple(point) for point in coords.tolist()]
+        self._distance = scalar_distance_function(edge_weight_type, tsplib_rounding)
+
+    def get(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        return self._distance(self._points[i], self._points[j])
+
+    def row(self, i: int) -> np.ndarray:
+        return pair_distances(self.coords, np.full(self.dimension, i), np.arange(self.dimension),
+                              self.edge_weight_type, self.tsplib_rounding)
+
+    def pairs(self, cities_a, cities_b) -> np.ndarray:
+        return pair_distances(self.coords, cities_a, cities_b,
+                              self.edge_weight_type, self.tsplib_rounding)
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        block = pairwise_distances(self.coords[start:stop], self.coords,
+                                   self.edge_weight_type, self.tsplib_rounding)
+        # TSPLIB GEO 공식은 같은 점 사이에도 1을 주므로 0으로 보정
+        block[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        return block
+
+class CachedOracle(DistanceOracle):
+    """
+    다른 오라클의 단건 조회(get) 결과를 크기 제한 캐시에 보관하는 래퍼
+
+    키는 (min(i, j), max(i, j)) 쌍을 i * n + j로 묶은 정수다. 적중 경로를
+    딕셔너리 조회 한 번으로 유지하기 위해 LRU 순서 대신 두 세대 방식을 쓴다:
+    현재 세대가 capacity / 2를 넘으면 이전 세대를 버리고 현재 세대를 이전
+    세대로 돌리며, 이전 세대에서 적중한 항목은 현재 세대로 다시 올린다.
+
+    스칼라 계산이 딕셔너리 조회보다 비싼 거리(GEO 등)에서만 이득이 있다
+    (experiments/bench_distance_cache.py). row와 pairs는 이미 벡터화되어
+    있으므로 캐시 없이 그대로 위임한다.
+    """
+
+    def __init__(self, oracle: DistanceOracle, capacity: int = 1 << 20):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        super().__init__(oracle.dimension)
+        self.oracle = oracle
+        self.kind = f"cached-{oracle.kind}"
+        self.capacity = capacity
+        self.lookups = 0
+        self.misses = 0
+        self._cache = {}
+        self._previous = {}
+        self._generation_size = max(1, capacity // 2)
+        self._compute = oracle.get
+        self.row = oracle.row
+        self.pairs = oracle.pairs
+        self.rows = oracle.rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.oracle.nbytes
+
+    @property
+    def hits(self) -> int:
+        return self.lookups - self.misses
+
+    def get(self, i: int, j: int):
+        self.lookups += 1
+        key = i * self.dimension + j if i < j else j * self.dimension + i
+        cache = self._cache
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        value = self._previous.get(key)
+        if value is None:
+            if i == j:
+                self.lookups -= 1
+                return 0.0
+            self.misses += 1
+            value = self._compute(i, j)
+        if len(cache) >= self._generation_size:
+            self._previous = cache
+            cache = self._cache = {}
+        cache[key] = value
+        return value
+
+    def cache_info(self) -> Dict[str, Any]:
+        """캐시 통계 (hits, misses, size, capacity, hit_rate)"""
+        lookups = self.lookups
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache) + len(self._previous),
+            "capacity": self.capacity,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """캐시 항목과 통계 초기화"""
+        self._cache.clear()
+        self._previous = {}
+        self.lookups = 0
+        self.misses = 0
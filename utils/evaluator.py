@@ -5,6 +5,9 @@ TSP 알고리즘의 성능을 평가하는 유틸리티
 
 import time
 from typing import List, Tuple, Dict, Any, Callable
+
+import numpy as np
+
 from utils.tsp_parser import TSPInstance
 
 class TSPResult:
@@ -34,21 +37,24 @@ def calculate_tour_cost(tour: List[int], distance_matrix = None,
     if not tour:
         return float('inf')
     
+    if instance is not None or isinstance(distance_matrix, np.ndarray):
+        # 배열 기반: 모든 간선 거리를 한 번에 조회
+        order = np.asarray(tour, dtype=np.intp)
+        next_order = np.roll(order, -1)  # 마지막 도시에서 첫 번째 도시로 돌아감
+        if instance is not None:
+            return float(instance.oracle.pairs(order, next_order).sum(dtype=np.float64))
+        return float(distance_matrix[order, next_order].sum(dtype=np.float64))
+    
+    if distance_matrix is None:
+        raise ValueError("distance_matrix or instance parameter required")
+    
     total_cost = 0.0
     n = len(tour)
     
     for i in range(n):
         current_city = tour[i]
         next_city = tour[(i + 1) % n]  # 마지막 도시에서 첫 번째 도시로 돌아감
-        
-        if instance and instance.large_instance:
-            # 대용량 인스턴스: 실시간 계산
-            total_cost += instance.get_distance(current_city, next_city)
-        elif distance_matrix is not None:
-            # 일반 인스턴스: 미리 계산된 행렬 사용
-            total_cost += distance_matrix[current_city][next_city]
-        else:
-            raise ValueError("distance_matrix or instance parameter required")
+        total_cost += distance_matrix[current_city][next_city]
     
     return total_cost
 
@@ -105,7 +111,7 @@ def evaluate_algorithm(algorithm_func: Callable[[TSPInstance], Tuple[List[int],
             return TSPResult([], float('inf'), runtime, algorithm_name, instance.name)
         
         # 비용 재계산 (검증)
-        calculated_cost = calculate_tour_cost(tour, instance.distance_matrix, instance)
+        calculated_cost = calculate_tour_cost(tour, instance=instance)
         if abs(calculated_cost - cost) > 1e-6:
             print(f"⚠️  비용 불일치: 반환값={cost:.2f}, 계산값={calculated_cost:.2f}")
             cost = calculated_cost
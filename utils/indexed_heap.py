@@ -0,0 +1,112 @@
+"""
+Indexed Priority Queue
+decrease-key를 지원하는 인덱스 이진 힙 (Prim, Dijkstra 등 희소 그래프 알고리즘용)
+"""
+
+import math
+from typing import Tuple
+
+class IndexedMinHeap:
+    """
+    0..capacity-1 정수 항목을 키 순으로 꺼내는 이진 최소 힙
+
+    항목마다 힙 안의 위치를 배열로 기억하므로 decrease_key가 O(log n)이다.
+    키가 같으면 번호가 작은 항목이 먼저 나온다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._heap = []
+        self._position = [-1] * capacity
+        self._key = [math.inf] * capacity
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self._position[item] != -1
+
+    def key(self, item: int) -> float:
+        """항목의 현재 키 (힙에 없으면 마지막으로 가졌던 키 또는 inf)"""
+        return self._key[item]
+
+    def push(self, item: int, key: float):
+        """새 항목 추가"""
+        if self._position[item] != -1:
+            raise ValueError(f"Item {item} is already in the heap")
+        self._key[item] = key
+        self._position[item] = len(self._heap)
+        self._heap.append(item)
+        self._sift_up(len(self._heap) - 1)
+
+    def decrease_key(self, item: int, key: float):
+        """힙에 있는 항목의 키를 더 작은 값으로 변경"""
+        if key > self._key[item]:
+            raise ValueError("decrease_key cannot increase a key")
+        self._key[item] = key
+        self._sift_up(self._position[item])
+
+    def push_or_decrease(self, item: int, key: float) -> bool:
+        """
+        힙에 없으면 추가하고, 있으면 키가 더 작을 때만 갱신
+
+        Returns:
+            bool: 추가하거나 키를 줄였으면 True
+        """
+        if self._position[item] == -1:
+            self.push(item, key)
+            return True
+        if key < self._key[item]:
+            self.decrease_key(item, key)
+            return True
+        return False
+
+    def pop(self) -> Tuple[int, float]:
+        """키가 가장 작은 (항목, 키)를 꺼냄"""
+        heap = self._heap
+        if not heap:
+            raise IndexError("pop from an empty heap")
+        top = heap[0]
+        last = heap.pop()
+        self._position[top] = -1
+        if heap:
+            heap[0] = last
+            self._position[last] = 0
+            self._sift_down(0)
+        return top, self._key[top]
+
+    def _less(self, a: int, b: int) -> bool:
+        key_a, key_b = self._key[a], self._key[b]
+        return key_a < key_b or (key_a == key_b and a < b)
+
+    def _sift_up(self, index: int):
+        heap, position = self._heap, self._position
+        item = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_item = heap[parent]
+            if not self._less(item, parent_item):
+                break
+            heap[index] = parent_item
+            position[parent_item] = index
+            index = parent
+        heap[index] = item
+        position[item] = index
+
+    def _sift_down(self, index: int):
+        heap, position = self._heap, self._position
+        size = len(heap)
+        item = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._less(heap[child + 1], heap[child]):
+                child += 1
+            if not self._less(heap[child], item):
+                break
+            heap[index] = heap[child]
+            position[heap[child]] = index
+            index = child
+        heap[index] = item
+        position[item] = index
@@ -0,0 +1,172 @@
+"""
+TSP Instance Binary Cache
+파싱한 TSP 인스턴스를 .npy 파일로 저장해 두고 메모리 매핑으로 다시 읽는 유틸리티
+
+원본 파일 옆의 캐시 디렉토리에 다음 파일들을 만든다.
+    <stem>-<hash>.meta.json              메타데이터 (원본 경로, 크기, 수정 시각 등)
+    <stem>-<hash>.coords.npy             (n, 2) float64 좌표
+    <stem>-<hash>.matrix-<key>.npy       거리 행렬 (선택, 저장 방식별)
+    <stem>-<hash>.candidates-<key>.npy   후보 이웃 목록 (선택, 방식과 k별)
+원본 파일의 크기나 수정 시각이 메타데이터와 다르면 캐시는 무효로 간주된다.
+"""
+
+import os
+import json
+import glob
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+CACHE_DIR_NAME = ".tsp_cache"
+CACHE_FORMAT_VERSION = 1
+
+def default_cache_dir(file_path: str) -> str:
+    """원본 TSP 파일과 같은 디렉토리 아래의 캐시 디렉토리 경로"""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+
+def cache_prefix(file_path: str, cache_dir: str = None) -> str:
+    """원본 경로로부터 캐시 파일 공통 접두어 생성 (파일 이름 + 절대 경로 해시)"""
+    source_path = os.path.abspath(file_path)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    path_hash = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(cache_dir or default_cache_dir(file_path), f"{stem}-{path_hash}")
+
+def matrix_cache_path(file_path: str, matrix_key: str, cache_dir: str = None) -> str:
+    """거리 행렬 캐시 파일 경로 (예: matrix_key="condensed-float32")"""
+    return f"{cache_prefix(file_path, cache_dir)}.matrix-{matrix_key}.npy"
+
+def candidates_cache_path(file_path: str, candidates_key: str, cache_dir: str = None) -> str:
+    """후보 이웃 목록 캐시 파일 경로 (예: candidates_key="knn-10")"""
+    return f"{cache_prefix(file_path, cache_dir)}.candidates-{candidates_key}.npy"
+
+def source_stamp(file_path: str) -> Dict[str, Any]:
+    """캐시 유효성 판단에 쓰는 원본 파일 정보 (경로, 크기, 수정 시각)"""
+    stat = os.stat(file_path)
+    return {
+        "path": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+def _atomic_save(path: str, array: np.ndarray):
+    """임시 파일에 저장한 뒤 교체하여 중간에 깨진 캐시가 남지 않도록 저장"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        np.save(file, array)
+    os.replace(temp_path, path)
+
+def load_cache(file_path: str, matrix_key: str = None,
+               cache_dir: str = None) -> Optional[Tuple[Dict[str, Any], np.ndarray, Optional[np.ndarray]]]:
+    """
+    유효한 캐시가 있으면 메모리 매핑으로 읽어서 반환
+
+    Args:
+        file_path: 원본 TSP 파일 경로
+        matrix_key: 함께 읽을 거리 행렬의 키 (None이면 좌표만)
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+
+    Returns:
+        (메타데이터, 좌표, 거리 행렬 또는 None) 또는 캐시가 없거나 오래되었으면 None
+    """
+    prefix = cache_prefix(file_path, cache_dir)
+    try:
+        with open(f"{prefix}.meta.json", "r", encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != CACHE_FORMAT_VERSION or meta.get("source") != source_stamp(file_path):
+        return None
+
+    try:
+        coords = np.load(f"{prefix}.coords.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    matrix = None
+    if matrix_key is not None:
+        try:
+            matrix = np.load(matrix_cache_path(file_path, matrix_key, cache_dir), mmap_mode="r")
+        except (OSError, ValueError):
+            matrix = None
+
+    return meta, coords, matrix
+
+def save_cache(file_path: str, meta: Dict[str, Any], coords: np.ndarray,
+               cache_dir: str = None):
+    """
+    좌표와 메타데이터를 캐시에 저장 (이전 버전의 행렬 캐시는 삭제)
+
+    Args:
+        file_path: 원본 TSP 파일 경로
+        meta: 인스턴스 메타데이터 (name, dimension, edge_weight_type 등)
+        coords: (n, 2) 좌표 배열
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+    """
+    prefix = cache_prefix(file_path, cache_dir)
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+
+    # 원본이 바뀌었다면 예전 행렬과 후보 목록은 더 이상 맞지 않음
+    for pattern in ("matrix-*.npy", "candidates-*.npy"):
+        for stale_path in glob.glob(f"{glob.escape(prefix)}.{pattern}"):
+            os.remove(stale_path)
+
+    _atomic_save(f"{prefix}.coords.npy", np.ascontiguousarray(coords, dtype=np.float64))
+
+    meta = dict(meta, version=CACHE_FORMAT_VERSION, source=source_stamp(file_path))
+    temp_path = f"{prefix}.meta.json.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, f"{prefix}.meta.json")
+
+def ensure_instance_cache(instance, cache_dir: str = None) -> bool:
+    """
+    인스턴스의 좌표 캐시가 없거나 오래되었으면 새로 저장
+
+    행렬이나 후보 목록 캐시를 추가하기 전에 호출한다. 새로 저장하면 오래된
+    행렬과 후보 목록 파일이 함께 정리된다.
+
+    Args:
+        instance: 원본 파일에서 읽은 TSPInstance
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+
+    Returns:
+        bool: 원본 파일이 없는 인스턴스(source_path가 None)이면 False
+    """
+    if instance.source_path is None:
+        return False
+    if load_cache(instance.source_path, cache_dir=cache_dir) is None:
+        meta = {"name": instance.name, "dimension": instance.dimension,
+                "edge_weight_type": instance.edge_weight_type}
+        save_cache(instance.source_path, meta, instance.coords, cache_dir)
+    return True
+
+def save_matrix_cache(file_path: str, matrix_key: str, values: np.ndarray,
+                      cache_dir: str = None):
+    """거리 행렬(밀집 또는 condensed 배열)을 캐시에 저장"""
+    path = matrix_cache_path(file_path, matrix_key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_save(path, values)
+
+def load_candidates_cache(file_path: str, candidates_key: str,
+                          cache_dir: str = None) -> Optional[np.ndarray]:
+    """
+    유효한 캐시의 후보 이웃 목록을 메모리 매핑으로 읽음
+
+    Returns:
+        (n, k) int32 배열 또는 캐시가 없거나 오래되었으면 None
+    """
+    if load_cache(file_path, cache_dir=cache_dir) is None:
+        return None
+    try:
+        return np.load(candidates_cache_path(file_path, candidates_key, cache_dir), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+def save_candidates_cache(file_path: str, candidates_key: str, candidates: np.ndarray,
+                          cache_dir: str = None):
+    """후보 이웃 목록을 캐시에 저장 (좌표 캐시가 유효할 때만 의미가 있음)"""
+    path = candidates_cache_path(file_path, candidates_key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_save(path, candidates)
@@ -0,0 +1,591 @@
+"""
+Spatial Index
+도시 좌표에 대한 최근접 질의(k-최근접, 반경, 방문하지 않은 최근접 도시)를 위한 공간 인덱스
+
+거리는 좌표 평면의 유클리드 거리다. EUC_2D(반올림 없음)에서는 TSP 거리와 같고,
+CEIL_2D, ATT 등 유클리드 거리에 단조인 타입에서는 순서만 같다 (반올림으로 같아진 값의
+동점 처리는 다를 수 있음). 동점이면 항상 인덱스가 작은 도시를 먼저 반환한다.
+"""
+
+import math
+import heapq
+from typing import List
+
+import numpy as np
+
+def quadrant_of(dx: float, dy: float) -> int:
+    """
+    상대 좌표 (dx, dy)의 사분면 번호 0~3
+
+    (dx > 0, dy >= 0) = 0, (dx <= 0, dy > 0) = 1, (dx < 0, dy <= 0) = 2,
+    (dx >= 0, dy < 0) = 3이고 같은 좌표 (0, 0)은 0이다.
+    """
+    if dx < 0 and dy <= 0:
+        return 2
+    if dx <= 0 and dy > 0:
+        return 1
+    if dx >= 0 and dy >= 0:
+        return 0
+    return 3
+
+class KDTree:
+    """
+    배열 기반 2차원 KD-트리 (노드 객체 없이 노드 번호로 인덱싱하는 병렬 배열)
+
+    각 노드는 `order` 순열의 연속 구간 [start, end)를 소유하고, 리프가 아니면
+    분산이 큰 축의 중앙값으로 두 자식에게 나눈다. 노드마다 실제 점들의 경계 상자를
+    보관해 가지치기에 쓰고, 살아 있는(삭제되지 않은) 점 수를 세어 두어
+    방문한 도시를 제거하면서 질의하는 nearest_unvisited가 빈 서브트리를 건너뛴다.
+    """
+
+    def __init__(self, coords: np.ndarray, leaf_size: int = 8):
+        points = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+        self.dimension = n
+        self.leaf_size = max(1, leaf_size)
+        self.coords = points
+
+        order = np.arange(n, dtype=np.int64)
+        starts, ends, lefts, rights, parents = [], [], [], [], []
+        boxes = []
+
+        # (start, end, parent, 부모에서의 방향) 스택으로 반복 분할
+        stack = [(0, n, -1, 0)] if n else []
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(starts)
+            segment = order[start:end]
+            block = points[segment]
+            low = block.min(axis=0)
+            high = block.max(axis=0)
+
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            parents.append(parent)
+            boxes.append((low[0], low[1], high[0], high[1]))
+            if parent != -1:
+                if side == 0:
+                    lefts[parent] = node
+                else:
+                    rights[parent] = node
+
+            if end - start <= self.leaf_size:
+                continue
+
+            axis = 0 if high[0] - low[0] >= high[1] - low[1] else 1
+            middle = (start + end) // 2
+            partition = np.argpartition(block[:, axis], middle - start, kind="introselect")
+            order[start:end] = segment[partition]
+            stack.append((middle, end, node, 1))
+            stack.append((start, middle, node, 0))
+
+        self.order = order
+        self.node_start = np.array(starts, dtype=np.int64)
+        self.node_end = np.array(ends, dtype=np.int64)
+        self.node_left = np.array(lefts, dtype=np.int64)
+        self.node_right = np.array(rights, dtype=np.int64)
+        self.node_parent = np.array(parents, dtype=np.int64)
+        self.node_box = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+        # 각 점이 속한 리프 노드
+        self.leaf_of = np.empty(n, dtype=np.int64)
+        leaves = np.flatnonzero(self.node_left == -1)
+        for leaf in leaves.tolist():
+            self.leaf_of[order[starts[leaf]:ends[leaf]]] = leaf
+
+        # 질의 루프는 파이썬 스칼라 접근이 빠르므로 리스트 사본을 사용
+        self._xs = points[:, 0].tolist()
+        self._ys = points[:, 1].tolist()
+        self._order = order.tolist()
+        self._start = starts
+        self._end = ends
+        self._left = lefts
+        self._right = rights
+        self._parent = parents
+        self._box = self.node_box.tolist()
+        self.reset()
+
+    def __len__(self) -> int:
+        """삭제되지 않은 점의 수"""
+        return self._alive[0] if self._alive else 0
+
+    def reset(self):
+        """모든 삭제 표시 제거"""
+        self._removed = [False] * self.dimension
+        self._alive = [end - start for start, end in zip(self._start, self._end)]
+
+    def is_removed(self, i: int) -> bool:
+        return self._removed[i]
+
+    def remove(self, i: int):
+        """점 i에 삭제 표시 (이후 live_only 질의에서 제외)"""
+        if self._removed[i]:
+            return
+        self._removed[i] = True
+        node = int(self.leaf_of[i])
+        alive = self._alive
+        parent = self._parent
+        while node != -1:
+            alive[node] -= 1
+            node = parent[node]
+
+    def restore(self, i: int):
+        """점 i의 삭제 표시 해제 (reset()과 달리 O(log n))"""
+        if not self._removed[i]:
+            return
+        self._removed[i] = False
+        node = int(self.leaf_of[i])
+        alive = self._alive
+        parent = self._parent
+        while node != -1:
+            alive[node] += 1
+            node = parent[node]
+
+    def _box_distance(self, node: int, x: float, y: float) -> float:
+        low_x, low_y, high_x, high_y = self._box[node]
+        dx = low_x - x if x < low_x else (x - high_x if x > high_x else 0.0)
+        dy = low_y - y if y < low_y else (y - high_y if y > high_y else 0.0)
+        return dx * dx + dy * dy
+
+    def query(self, x: float, y: float, k: int = 1, live_only: bool = False) -> List[int]:
+        """
+        점 (x, y)에서 가까운 k개 점의 인덱스를 거리 순으로 반환
+
+        Args:
+            x, y: 질의 좌표
+            k: 반환할 점의 수
+            live_only: True이면 삭제 표시된 점 제외
+
+        Returns:
+            List[int]: 가까운 순서의 점 인덱스 (동점이면 작은 인덱스 먼저)
+        """
+        if k <= 0 or not self.dimension:
+            return []
+        xs, ys, order, removed, alive = self._xs, self._ys, self._order, self._removed, self._alive
+        start, end, left, right = self._start, self._end, self._left, self._right
+
+        # (-거리², -인덱스) 최대 힙: 루트가 현재 k번째 후보
+        best = []
+        stack = [(0.0, 0)]
+        while stack:
+            box_distance, node = stack.pop()
+            if len(best) == k and box_distance > -best[0][0]:
+                continue
+            if live_only and alive[node] == 0:
+                continue
+
+            if left[node] == -1:
+                for point in order[start[node]:end[node]]:
+                    if live_only and removed[point]:
+                        continue
+                    dx = xs[point] - x
+                    dy = ys[point] - y
+                    entry = (-(dx * dx + dy * dy), -point)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                continue
+
+            # 가까운 자식을 나중에 넣어 먼저 탐색
+            near, far = left[node], right[node]
+            near_distance = self._box_distance(near, x, y)
+            far_distance = self._box_distance(far, x, y)
+            if far_distance < near_distance:
+                near, far = far, near
+                near_distance, far_distance = far_distance, near_distance
+            stack.append((far_distance, far))
+            stack.append((near_distance, near))
+
+        best.sort(reverse=True)
+        return [-point for _, point in best]
+
+    def query_quadrant(self, x: float, y: float, k: int, quadrant: int) -> List[int]:
+        """
+        점 (x, y) 기준 한 사분면 안에서 가까운 k개 점의 인덱스를 거리 순으로 반환
+
+        사분면 번호는 quadrant_of와 같다. 사분면과 겹치지 않는 노드는 건너뛰고,
+        겹치는 노드는 사분면으로 잘라 낸 경계 상자까지의 거리로 가지치기한다.
+
+        Args:
+            x, y: 질의 좌표
+            k: 반환할 점의 수
+            quadrant: 사분면 번호 0~3
+
+        Returns:
+            List[int]: 가까운 순서의 점 인덱스 (동점이면 작은 인덱스 먼저, 부족하면 있는 만큼)
+        """
+        if k <= 0 or not self.dimension:
+            return []
+        xs, ys, order, box = self._xs, self._ys, self._order, self._box
+        start, end, left, right = self._start, self._end, self._left, self._right
+        # 사분면의 닫힌 영역: x 방향 (오른쪽이면 True), y 방향 (위쪽이면 True)
+        right_side = quadrant in (0, 3)
+        upper_side = quadrant in (0, 1)
+
+        def clipped_distance(node: int) -> float:
+            low_x, low_y, high_x, high_y = box[node]
+            if right_side:
+                low_x = max(low_x, x)
+            else:
+                high_x = min(high_x, x)
+            if upper_side:
+                low_y = max(low_y, y)
+            else:
+                high_y = min(high_y, y)
+            if low_x > high_x or low_y > high_y:
+                return math.inf
+            dx = low_x - x if x < low_x else (x - high_x if x > high_x else 0.0)
+            dy = low_y - y if y < low_y else (y - high_y if y > high_y else 0.0)
+            return dx * dx + dy * dy
+
+        best = []
+        stack = [(clipped_distance(0), 0)]
+        while stack:
+            box_distance, node = stack.pop()
+            if box_distance == math.inf or (len(best) == k and box_distance > -best[0][0]):
+                continue
+
+            if left[node] == -1:
+                for point in order[start[node]:end[node]]:
+                    dx = xs[point] - x
+                    dy = ys[point] - y
+                    if quadrant_of(dx, dy) != quadrant:
+                        continue
+                    entry = (-(dx * dx + dy * dy), -point)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                continue
+
+            near, far = left[node], right[node]
+            near_distance = clipped_distance(near)
+            far_distance = clipped_distance(far)
+            if far_distance < near_distance:
+                near, far = far, near
+                near_distance, far_distance = far_distance, near_distance
+            stack.append((far_distance, far))
+            stack.append((near_distance, near))
+
+        best.sort(reverse=True)
+        return [-point for _, point in best]
+
+    def query_radius(self, x: float, y: float, radius: float, live_only: bool = False) -> List[int]:
+        """
+        점 (x, y)에서 거리 radius 이내의 모든 점 인덱스를 거리 순으로 반환
+
+        Args:
+            x, y: 질의 좌표
+            radius: 반경 (경계 포함)
+            live_only: True이면 삭제 표시된 점 제외
+
+        Returns:
+            List[int]: 가까운 순서의 점 인덱스 (동점이면 작은 인덱스 먼저)
+        """
+        if not self.dimension:
+            return []
+        xs, ys, order, removed, alive = self._xs, self._ys, self._order, self._removed, self._alive
+        start, end, left, right = self._start, self._end, self._left, self._right
+        limit = radius * radius
+
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if live_only and alive[node] == 0:
+                continue
+            if self._box_distance(node, x, y) > limit:
+                continue
+            if left[node] == -1:
+                for point in order[start[node]:end[node]]:
+                    if live_only and removed[point]:
+                        continue
+                    dx = xs[point] - x
+                    dy = ys[point] - y
+                    squared = dx * dx + dy * dy
+                    if squared <= limit:
+                        found.append((squared, point))
+                continue
+            stack.append(right[node])
+            stack.append(left[node])
+
+        found.sort()
+        return [point for _, point in found]
+
+    def nearest_in_norm(self, x: float, y: float, norm: float = 2, live_only: bool = False) -> int:
+        """
+        점 (x, y)에서 L1, L2, L∞ 노름으로 가장 가까운 점의 인덱스 (없으면 -1)
+
+        MAN_2D(L1)나 MAX_2D(L∞)처럼 유클리드 순서와 다른 거리에서 정확한 최근접 점을
+        찾을 때 쓴다. 경계 상자까지의 거리도 같은 노름으로 계산해 가지치기한다.
+
+        Args:
+            x, y: 질의 좌표
+            norm: 1, 2 또는 math.inf
+            live_only: True이면 삭제 표시된 점 제외
+
+        Returns:
+            int: 가장 가까운 점의 인덱스 (동점이면 작은 인덱스)
+        """
+        if norm not in (1, 2, math.inf):
+            raise ValueError(f"Unsupported norm: {norm}")
+        if not self.dimension:
+            return -1
+        xs, ys, order, removed, alive, box = self._xs, self._ys, self._order, self._removed, self._alive, self._box
+        start, end, left, right = self._start, self._end, self._left, self._right
+
+        def measure(dx: float, dy: float) -> float:
+            # L2는 제곱 거리로 비교
+            if norm == 1:
+                return dx + dy
+            if norm == 2:
+                return dx * dx + dy * dy
+            return dx if dx > dy else dy
+
+        def box_distance(node: int) -> float:
+            low_x, low_y, high_x, high_y = box[node]
+            dx = low_x - x if x < low_x else (x - high_x if x > high_x else 0.0)
+            dy = low_y - y if y < low_y else (y - high_y if y > high_y else 0.0)
+            return measure(dx, dy)
+
+        best_distance, best_point = math.inf, -1
+        stack = [(0.0, 0)]
+        while stack:
+            node_distance, node = stack.pop()
+            if node_distance > best_distance:
+                continue
+            if live_only and alive[node] == 0:
+                continue
+
+            if left[node] == -1:
+                for point in order[start[node]:end[node]]:
+                    if live_only and removed[point]:
+                        continue
+                    distance = measure(abs(xs[point] - x), abs(ys[point] - y))
+                    if distance < best_distance or (distance == best_distance and point < best_point):
+                        best_distance, best_point = distance, point
+                continue
+
+            near, far = left[node], right[node]
+            near_distance = box_distance(near)
+            far_distance = box_distance(far)
+            if far_distance < near_distance:
+                near, far = far, near
+                near_distance, far_distance = far_distance, near_distance
+            stack.append((far_distance, far))
+            stack.append((near_distance, near))
+
+        return best_point
+
+    def nearest_unvisited(self, city: int) -> int:
+        """
+        도시 city에서 가장 가까운, 삭제 표시되지 않은 도시 (없으면 -1)
+
+        방문한 도시를 remove()로 표시하면서 호출하면 최근접 이웃 투어를 만들 수 있다.
+        city 자신이 삭제되지 않았다면 자신이 반환된다.
+        """
+        result = self.query(self._xs[city], self._ys[city], 1, live_only=True)
+        return result[0] if result else -1
+
+class GridIndex:
+    """
+    균일 격자 버킷 인덱스
+
+    좌표의 경계 상자를 셀당 평균 cities_per_cell개 도시가 들어가도록 나누고,
+    도시들을 셀 번호 순으로 정렬한 하나의 배열에 보관한다 (셀 c의 도시는
+    cell_start[c] 부터 살아 있는 개수만큼). 삭제는 셀 구간 안에서 마지막 살아 있는
+    도시와 자리를 바꾸는 O(1) 연산이다. 최근접 질의는 질의 셀에서 시작해
+    한 칸씩 넓어지는 사각 고리를 검사하고, 다음 고리까지의 최소 거리가 현재
+    최선보다 크면 멈춘다. 비어 있는 영역을 빨리 건너뛰도록 BLOCK x BLOCK 셀
+    묶음마다 살아 있는 도시 수도 세어 둔다.
+    """
+
+    BLOCK = 8
+
+    def __init__(self, coords: np.ndarray, cities_per_cell: float = 2.0):
+        points = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(points)
+        self.dimension = n
+        self.coords = points
+
+        low = points.min(axis=0) if n else np.zeros(2)
+        high = points.max(axis=0) if n else np.zeros(2)
+        span = high - low
+        cell_count = max(1.0, n / cities_per_cell)
+        if span.min() > 0:
+            cell_size = float(np.sqrt(span[0] * span[1] / cell_count))
+        else:
+            # 모든 도시가 한 직선 위에 있으면 긴 축만 나눔
+            cell_size = float(span.max()) / cell_count
+        # 한 축이 지나치게 길어지지 않도록 셀 크기의 하한을 둠
+        cell_size = max(cell_size, float(span.max()) / 4096, 1e-9)
+
+        self.origin_x, self.origin_y = float(low[0]), float(low[1])
+        self.cell_size = cell_size
+        self.columns = int(span[0] // cell_size) + 1
+        self.rows = int(span[1] // cell_size) + 1
+
+        cell_x = np.minimum(((points[:, 0] - low[0]) // cell_size).astype(np.int64), self.columns - 1)
+        cell_y = np.minimum(((points[:, 1] - low[1]) // cell_size).astype(np.int64), self.rows - 1)
+        cells = cell_y * self.columns + cell_x
+        order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=self.rows * self.columns)
+
+        self.cell_of = cells
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._cell_of = cells.tolist()
+        self._cell_start = self.cell_start.tolist()
+        self._initial_counts = counts.tolist()
+        self._initial_order = order.tolist()
+        self._xs = points[:, 0].tolist()
+        self._ys = points[:, 1].tolist()
+
+        self.block_columns = (self.columns + self.BLOCK - 1) // self.BLOCK
+        self.block_rows = (self.rows + self.BLOCK - 1) // self.BLOCK
+        block_ids = (cell_y // self.BLOCK) * self.block_columns + cell_x // self.BLOCK
+        self._initial_block_counts = np.bincount(
+            block_ids, minlength=self.block_rows * self.block_columns).tolist()
+        self.reset()
+
+    def __len__(self) -> int:
+        """삭제되지 않은 도시의 수"""
+        return self._alive
+
+    def reset(self):
+        """모든 삭제 표시 제거"""
+        self._points = list(self._initial_order)
+        self._position = [0] * self.dimension
+        for position, point in enumerate(self._points):
+            self._position[point] = position
+        self._count = list(self._initial_counts)
+        self._block_count = list(self._initial_block_counts)
+        self._removed = [False] * self.dimension
+        self._alive = self.dimension
+
+    def is_removed(self, i: int) -> bool:
+        return self._removed[i]
+
+    def remove(self, i: int):
+        """도시 i를 버킷에서 제거"""
+        if self._removed[i]:
+            return
+        self._removed[i] = True
+        self._alive -= 1
+
+        cell = self._cell_of[i]
+        points, position = self._points, self._position
+        last = self._cell_start[cell] + self._count[cell] - 1
+        current = position[i]
+        other = points[last]
+        points[current], points[last] = other, i
+        position[other], position[i] = current, last
+        self._count[cell] -= 1
+
+        column, row = cell % self.columns, cell // self.columns
+        self._block_count[(row // self.BLOCK) * self.block_columns + column // self.BLOCK] -= 1
+
+    def nearest(self, x: float, y: float) -> int:
+        """
+        점 (x, y)에서 가장 가까운 살아 있는 도시 (없으면 -1)
+
+        유클리드 거리 math.sqrt(dx² + dy²) 기준이며 동점이면 인덱스가 작은 도시를 반환한다.
+        """
+        if self._alive == 0:
+            return -1
+
+        columns, rows, size = self.columns, self.rows, self.cell_size
+        fx = (x - self.origin_x) / size
+        fy = (y - self.origin_y) / size
+        center_x = min(max(int(fx // 1), 0), columns - 1)
+        center_y = min(max(int(fy // 1), 0), rows - 1)
+        max_ring = max(center_x, columns - 1 - center_x, center_y, rows - 1 - center_y)
+
+        best_distance = math.inf
+        best_city = -1
+        ring = 0
+        while ring <= max_ring:
+            low_x, high_x = center_x - ring, center_x + ring
+            low_y, high_y = center_y - ring, center_y + ring
+            if ring == 0:
+                best_distance, best_city = self._scan_cell(center_y * columns + center_x, x, y,
+                                                           best_distance, best_city)
+            else:
+                best_distance, best_city = self._scan_ring(low_x, high_x, low_y, high_y, x, y,
+                                                           best_distance, best_city)
+
+            # 다음 고리의 셀들은 (2r+1)^2 사각형 바깥에 있음
+            gap = min(fx - low_x, high_x + 1 - fx, fy - low_y, high_y + 1 - fy) * size
+            if best_city != -1 and gap > best_distance:
+                break
+            ring += 1
+            if best_city == -1 and ring > 1 and ring % self.BLOCK == 0:
+                # 주변이 오래 비어 있으면 블록 단위로 살아 있는 도시가 있는 고리까지 건너뜀
+                ring = max(ring, self._first_live_ring(center_x, center_y, ring, max_ring))
+
+        return best_city
+
+    def nearest_unvisited(self, city: int) -> int:
+        """도시 city에서 가장 가까운 살아 있는 도시 (city 자신이 살아 있으면 자신)"""
+        return self.nearest(self._xs[city], self._ys[city])
+
+    def _scan_cell(self, cell: int, x: float, y: float, best_distance: float, best_city: int):
+        count = self._count[cell]
+        if count == 0:
+            return best_distance, best_city
+        start = self._cell_start[cell]
+        xs, ys = self._xs, self._ys
+        for point in self._points[start:start + count]:
+            dx = xs[point] - x
+            dy = ys[point] - y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance < best_distance or (distance == best_distance and point < best_city):
+                best_distance, best_city = distance, point
+        return best_distance, best_city
+
+    def _scan_ring(self, low_x: int, high_x: int, low_y: int, high_y: int,
+                   x: float, y: float, best_distance: float, best_city: int):
+        columns, rows = self.columns, self.rows
+        start_x, stop_x = max(low_x, 0), min(high_x, columns - 1)
+        # 위, 아래 행
+        for row in (low_y, high_y):
+            if 0 <= row < rows:
+                base = row * columns
+                for column in range(start_x, stop_x + 1):
+                    if self._count[base + column]:
+                        best_distance, best_city = self._scan_cell(base + column, x, y,
+                                                                   best_distance, best_city)
+        # 왼쪽, 오른쪽 열 (모서리 제외)
+        start_y, stop_y = max(low_y + 1, 0), min(high_y - 1, rows - 1)
+        for column in (low_x, high_x):
+            if 0 <= column < columns:
+                for row in range(start_y, stop_y + 1):
+                    cell = row * columns + column
+                    if self._count[cell]:
+                        best_distance, best_city = self._scan_cell(cell, x, y, best_distance, best_city)
+        return best_distance, best_city
+
+    def _first_live_ring(self, center_x: int, center_y: int, ring: int, max_ring: int) -> int:
+        """ring 이상에서 살아 있는 도시를 가진 블록에 닿는 첫 고리 (보수적인 하한)"""
+        block = self.BLOCK
+        block_x, block_y = center_x // block, center_y // block
+        block_count = self._block_count
+        block_columns, block_rows = self.block_columns, self.block_rows
+        # 블록 고리 b에 속한 셀은 중심에서 최소 (b - 1) * BLOCK + 1 고리 떨어져 있음
+        block_ring = max(0, ring // block - 1)
+        max_block_ring = max(block_x, block_columns - 1 - block_x, block_y, block_rows - 1 - block_y)
+        while block_ring <= max_block_ring:
+            low_x, high_x = block_x - block_ring, block_x + block_ring
+            low_y, high_y = block_y - block_ring, block_y + block_ring
+            for row in range(max(low_y, 0), min(high_y, block_rows - 1) + 1):
+                if row in (low_y, high_y):
+                    columns = range(max(low_x, 0), min(high_x, block_columns - 1) + 1)
+                else:
+                    columns = [column for column in (low_x, high_x) if 0 <= column < block_columns]
+                for column in columns:
+                    if block_count[row * block_columns + column]:
+                        return max(ring, (block_ring - 1) * block + 1)
+            block_ring += 1
+        return max_ring + 1
@@ -3,40 +3,499 @@ TSP File Parser and Distance Calculator
 TSP 파일을 파싱하고 거리 행렬을 계산하는 유틸리티
 """
 
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import glob
 import math
-from typing import List, Tuple, Dict, Any
+import warnings
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional
+
+import numpy as np
+
+from utils.distance_matrix import (
+    CondensedDistanceMatrix, build_condensed_matrix, build_distance_matrix,
+    ExplicitMatrixBuilder, build_memmap_matrix, condensed_size, distance_dtype,
+    open_memmap_matrix
+)
+from utils.distance_oracle import CachedOracle, CondensedOracle, CoordinateOracle, DenseOracle, DistanceOracle
+from utils.instance_cache import (
+    ensure_instance_cache, load_cache, matrix_cache_path, save_cache, save_matrix_cache
+)
+from utils.spatial_index import GridIndex, KDTree
+
+# 이 도시 수 이상이면 거리 행렬을 만들지 않고 실시간 계산
+LARGE_INSTANCE_THRESHOLD = 50000
+
+# 실시간 계산 모드에서 distance_cache=True일 때의 기본 캐시 항목 수
+DEFAULT_DISTANCE_CACHE_SIZE = 1 << 20
+
+# 단건 계산이 캐시 조회보다 비싸서 거리 캐시를 켜는 거리 타입
+# (EUC_2D, ATT 등은 다시 계산하는 편이 더 빠름: experiments/bench_distance_cache.py)
+CACHED_EDGE_WEIGHT_TYPES = ("GEO",)
+
+# EDGE_WEIGHT_SECTION을 읽을 때 한 번에 변환하는 텍스트 크기 (문자 수)
+EXPLICIT_BATCH_CHARS = 1 << 20
+
+# 좌표 구역을 끝내는 키워드 (줄 맨 앞)
+_COORD_SECTION_END = re.compile(r"^\s*(EOF|DISPLAY_DATA_SECTION|EDGE_WEIGHT_SECTION)\b", re.MULTILINE)
 
 class TSPInstance:
-    """TSP 인스턴스를 표현하는 클래스"""
+    """TSP 인스턴스를 표현하는 클래스
+
+    좌표는 (n, 2) float64 배열(`coords`)로, 거리 행렬은 연속 메모리
+    ndarray(`matrix`) 또는 상삼각만 보관하는 CondensedDistanceMatrix로
+    보관한다. 기존 리스트 기반 API(`coordinates`, `distance_matrix`)는
+    처음 접근할 때 생성되는 호환용 뷰다.
+    
+    EXPLICIT 인스턴스는 좌표 없이(coords가 빈 배열) 거리 행렬만 가진다.
+    """
     
-    def __init__(self, name: str, coordinates: List[Tuple[float, float]], 
+    def __init__(self, name: str, coordinates, 
                  distance_matrix, dimension: int, 
-                 large_instance: bool = False):
+                 large_instance: bool = False, edge_weight_type: str = "EUC_2D",
+                 tsplib_rounding: bool = False):
         self.name = name
-        self.coordinates = coordinates
-        self.distance_matrix = distance_matrix
+        if coordinates is None:
+            coordinates = np.empty((0, 2))
+        self.coords = np.ascontiguousarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        if distance_matrix is None or len(distance_matrix) == 0:
+            self.matrix = None
+            self.storage = "none"
+        elif isinstance(distance_matrix, CondensedDistanceMatrix):
+            self.matrix = distance_matrix
+            self.storage = "condensed"
+        else:
+            dtype = distance_matrix.dtype if isinstance(distance_matrix, np.ndarray) else np.float64
+            self.matrix = np.ascontiguousarray(distance_matrix, dtype=dtype)
+            self.storage = "dense"
         self.dimension = dimension
-        self.large_instance = large_instance
+        self._large_instance = large_instance
+        self.edge_weight_type = edge_weight_type
+        self.tsplib_rounding = tsplib_rounding
+        self.source_path = None
+        self.display_coords = None
+        self._coordinates_view = None
+        self._distance_matrix_view = None
+        self._oracle = None
+        self.distance_cache_size = 0
+        self._spatial_indexes = {}
+        self.candidates = None  # (n, k) int32 후보 이웃 목록 (utils.candidates.build_candidates)
+        self.candidate_method = None
+    
+    @property
+    def coordinates(self) -> List[Tuple[float, float]]:
+        """(x, y) 튜플 리스트 형태의 좌표 (호환용 뷰)"""
+        if self._coordinates_view is None:
+            self._coordinates_view = [tuple(point) for point in self.coords.tolist()]
+        return self._coordinates_view
+    
+    @property
+    def large_instance(self) -> bool:
+        """True이면 거리 행렬 대신 좌표로부터 실시간 계산"""
+        return self._large_instance
+    
+    @large_instance.setter
+    def large_instance(self, value: bool):
+        self._large_instance = value
+        self._oracle = None
+    
+    @property
+    def oracle(self) -> DistanceOracle:
+        """
+        저장 방식에 맞는 거리 오라클 (처음 접근할 때 생성)
+        
+        솔버는 루프 밖에서 한 번 받아 get/row/pairs를 호출하면
+        조회마다 저장 방식을 분기하지 않아도 된다.
+        """
+        if self._oracle is None:
+            if self._large_instance or self.matrix is None:
+                self._oracle = CoordinateOracle(self.coords, self.edge_weight_type, self.tsplib_rounding)
+                if self.distance_cache_size > 0 and self.edge_weight_type in CACHED_EDGE_WEIGHT_TYPES:
+                    # 반복 조회되는 도시 쌍은 캐시에서 반환
+                    self._oracle = CachedOracle(self._oracle, self.distance_cache_size)
+            elif self.storage == "condensed":
+                self._oracle = CondensedOracle(self.matrix)
+            else:
+                self._oracle = DenseOracle(self.matrix)
+        return self._oracle
+    
+    def enable_distance_cache(self, capacity: int = DEFAULT_DISTANCE_CACHE_SIZE):
+        """
+        실시간 계산 모드의 get_distance 앞에 크기 제한 캐시를 둠
+        
+        캐시는 CACHED_EDGE_WEIGHT_TYPES(GEO)처럼 단건 계산이 비싼 거리에만
+        적용된다. 다른 거리 타입은 다시 계산하는 편이 빨라 캐시를 만들지 않고
+        경고를 낸다. 거리 행렬이 있는 인스턴스는 영향이 없다.
+        
+        Args:
+            capacity: 보관할 최대 도시 쌍 수 (0이면 캐시 해제)
+        """
+        if capacity > 0 and self.edge_weight_type not in CACHED_EDGE_WEIGHT_TYPES:
+            warnings.warn(
+                f"Distance cache ignored for {self.edge_weight_type}: only {', '.join(CACHED_EDGE_WEIGHT_TYPES)} "
+                f"distances are cached (recomputing is faster, see experiments/bench_distance_cache.py)",
+                stacklevel=2)
+        self.distance_cache_size = capacity
+        self._oracle = None
+    
+    def distance_cache_info(self) -> Optional[Dict[str, Any]]:
+        """거리 캐시 통계 (hits, misses, size, capacity, hit_rate), 캐시가 없으면 None"""
+        if isinstance(self.oracle, CachedOracle):
+            return self.oracle.cache_info()
+        return None
+    
+    def spatial_index(self, kind: str = "kdtree"):
+        """
+        좌표에 대한 공간 인덱스 반환 (처음 요청할 때 생성하고 이후 재사용)
+        
+        인덱스는 삭제 표시 상태를 가지므로, 방문 처리에 사용하는 솔버는
+        사용 전에 reset()을 호출해야 한다.
+        
+        Args:
+            kind: "kdtree" (k-최근접, 반경 질의) 또는 "grid" (격자 버킷, 방문하지 않은 최근접 도시)
+            
+        Returns:
+            KDTree 또는 GridIndex: 인스턴스 좌표에 대한 공간 인덱스
+        """
+        if not self.has_coordinates:
+            raise ValueError("Spatial indexes require city coordinates")
+        if kind not in self._spatial_indexes:
+            if kind == "kdtree":
+                self._spatial_indexes[kind] = KDTree(self.coords)
+            elif kind == "grid":
+                self._spatial_indexes[kind] = GridIndex(self.coords)
+            else:
+                raise ValueError(f"Unsupported spatial index: {kind}")
+        return self._spatial_indexes[kind]
+    
+    @property
+    def has_coordinates(self) -> bool:
+        """모든 도시의 좌표를 가지고 있는지 여부 (EXPLICIT 인스턴스는 False)"""
+        return len(self.coords) == self.dimension
+    
+    @property
+    def distance_matrix(self) -> List[List[float]]:
+        """리스트의 리스트 형태의 거리 행렬 (호환용 뷰, 행렬이 없으면 빈 리스트)"""
+        if self.matrix is None:
+            return []
+        if self._distance_matrix_view is None:
+            if self.storage == "condensed":
+                self._distance_matrix_view = self.matrix.to_dense().tolist()
+            else:
+                self._distance_matrix_view = self.matrix.tolist()
+        return self._distance_matrix_view
+    
+    def attach_memmap_matrix(self, path: str = None, dtype: str = "float32",
+                             cache_dir: str = None) -> CondensedDistanceMatrix:
+        """
+        디스크 기반 condensed 거리 행렬을 메모리 매핑으로 연결
+        
+        파일이 없으면 행 블록 단위로 새로 만든다. 연결 후에는 대용량
+        인스턴스도 실시간 계산 대신 O(1) 조회를 사용한다.
+        
+        Args:
+            path: .npy 파일 경로 (None이면 원본 TSP 파일의 캐시 디렉토리)
+            dtype: 저장 형식 ("float32", "int32", "float64")
+            cache_dir: path가 None일 때 사용할 캐시 디렉토리
+            
+        Returns:
+            CondensedDistanceMatrix: 연결된 메모리 매핑 행렬
+        """
+        if not self.has_coordinates:
+            raise ValueError("Memory-mapped matrices are built from coordinates")
+        if path is None:
+            if self.source_path is None:
+                raise ValueError("path is required for instances not loaded from a file")
+            # 캐시가 오래되었으면 메타데이터를 새로 써서 오래된 행렬 파일 정리
+            ensure_instance_cache(self, cache_dir)
+            path = matrix_cache_path(self.source_path, matrix_cache_key("condensed", dtype, self.tsplib_rounding),
+                                     cache_dir)
+        
+        if os.path.exists(path):
+            matrix = open_memmap_matrix(path, self.dimension)
+        else:
+            print(f"  💾 디스크 거리 행렬 생성 중 (n={self.dimension}, {dtype}): {path}")
+            matrix = build_memmap_matrix(self.coords, path, self.edge_weight_type, dtype,
+                                         tsplib_rounding=self.tsplib_rounding)
+        
+        self.matrix = matrix
+        self.storage = "condensed"
+        self.large_instance = False  # 오라클도 다시 생성됨
+        self._distance_matrix_view = None
+        return matrix
     
     def get_distance(self, i: int, j: int) -> float:
         """두 도시 간 거리 반환 (대용량 인스턴스 대응)"""
-        if self.large_instance:
-            # 실시간 계산
-            return euclidean_distance(self.coordinates[i], self.coordinates[j])
-        else:
-            # 미리 계산된 행렬 사용
-            return self.distance_matrix[i][j]
+        return self.oracle.get(i, j)
+    
+    def distance_row(self, i: int) -> np.ndarray:
+        """도시 i에서 모든 도시까지의 거리 배열 반환"""
+        return self.oracle.row(i)
+    
+    def pair_distances(self, cities_a, cities_b) -> np.ndarray:
+        """(cities_a[k], cities_b[k]) 쌍들의 거리를 한 번에 계산"""
+        return self.oracle.pairs(cities_a, cities_b)
 
-def parse_tsp_file(file_path: str) -> TSPInstance:
+def parse_tsp_file(file_path: str, storage: str = None, dtype: str = "float64",
+                   large_threshold: int = LARGE_INSTANCE_THRESHOLD,
+                   cache: bool = False, cache_matrix: bool = False,
+                   cache_dir: str = None, tsplib_rounding: bool = False,
+                   distance_cache: int = 0) -> TSPInstance:
     """
     TSP 파일을 파싱하여 TSPInstance 객체를 반환
     
     Args:
         file_path: TSP 파일 경로
+        storage: 거리 행렬 저장 방식 (None이면 좌표 인스턴스는 "dense", EXPLICIT은 "condensed")
+            - "dense": (n, n) 밀집 행렬
+            - "condensed": 상삼각 n(n-1)/2 원소만 보관 (O(1) 인덱스 조회)
+            - "memmap": condensed 행렬을 캐시 디렉토리의 파일로 만들고 메모리 매핑
+              (large_threshold와 관계없이 사용, 캐시 자동 활성화)
+        dtype: 거리 값 형식 ("float64", "float32", "int32" = TSPLIB 반올림 정수)
+        large_threshold: 이 도시 수 이상이면 거리 행렬 없이 실시간 계산
+        cache: True이면 바이너리 캐시(.npy)를 사용 (없거나 오래되면 새로 생성)
+        cache_matrix: True이면 거리 행렬도 캐시에 저장 (다음 실행 시 메모리 매핑)
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+        tsplib_rounding: True이면 EUC_2D, MAN_2D, MAX_2D 거리에 TSPLIB nint 반올림 적용
+            (공개된 최적해 값과 비교할 때 사용, CEIL_2D/ATT/GEO는 항상 정수 거리)
+        distance_cache: 실시간 계산 모드일 때 get_distance 결과를 보관할 캐시 크기
+            (0이면 사용 안 함, True이면 DEFAULT_DISTANCE_CACHE_SIZE, GEO 거리에만 적용되고
+            다른 거리 타입에는 경고 후 무시)
         
     Returns:
         TSPInstance: 파싱된 TSP 인스턴스
     """
+    if storage not in (None, "dense", "condensed", "memmap"):
+        raise ValueError(f"Unsupported distance storage: {storage}")
+    
+    if read_tsp_header(file_path).get("EDGE_WEIGHT_TYPE") == "EXPLICIT":
+        return parse_explicit_tsp_file(file_path, storage or "condensed", dtype, cache, cache_dir)
+    
+    storage = storage or "dense"
+    if storage == "memmap":
+        cache = True
+    
+    matrix_key = matrix_cache_key("dense" if storage == "dense" else "condensed", dtype, tsplib_rounding)
+    cached = load_cache(file_path, matrix_key, cache_dir) if cache else None
+    
+    if cached is not None:
+        meta, coords, matrix_values = cached
+        name = meta["name"]
+        edge_weight_type = meta["edge_weight_type"]
+    else:
+        name, edge_weight_type, coords = read_tsp_file(file_path)
+        matrix_values = None
+        if cache:
+            meta = {"name": name, "dimension": len(coords), "edge_weight_type": edge_weight_type}
+            save_cache(file_path, meta, coords, cache_dir)
+    
+    # 큰 인스턴스 판별 (기본 50,000개 도시 이상)
+    n = len(coords)
+    is_large = n >= large_threshold and storage != "memmap"
+    
+    if is_large:
+        print(f"  ⚠️  대용량 인스턴스 감지 (n={n}): 거리 행렬 실시간 계산 모드")
+        # 빈 거리 행렬 (메모리 절약)
+        distance_matrix = []
+    elif matrix_values is not None:
+        # 캐시된 거리 행렬 (메모리 매핑)
+        if storage in ("condensed", "memmap"):
+            distance_matrix = CondensedDistanceMatrix(matrix_values, n)
+        else:
+            distance_matrix = matrix_values
+    elif storage == "memmap":
+        # 디스크에 행 블록 단위로 기록 후 메모리 매핑
+        path = matrix_cache_path(file_path, matrix_key, cache_dir)
+        print(f"  💾 디스크 거리 행렬 생성 중 (n={n}, {dtype}): {path}")
+        distance_matrix = build_memmap_matrix(coords, path, edge_weight_type, dtype,
+                                              tsplib_rounding=tsplib_rounding)
+    else:
+        if storage == "condensed":
+            # 상삼각 condensed 거리 행렬 계산
+            distance_matrix = build_condensed_matrix(coords, edge_weight_type, dtype,
+                                                     tsplib_rounding=tsplib_rounding)
+            matrix_values = distance_matrix.values
+        else:
+            # 거리 행렬 계산
+            distance_matrix = build_distance_matrix(coords, edge_weight_type, dtype=dtype,
+                                                    tsplib_rounding=tsplib_rounding)
+            matrix_values = distance_matrix
+        if cache and cache_matrix:
+            save_matrix_cache(file_path, matrix_key, matrix_values, cache_dir)
+    
+    instance = TSPInstance(name, coords, distance_matrix, n, is_large, edge_weight_type, tsplib_rounding)
+    instance.source_path = file_path
+    if is_large and distance_cache:
+        instance.enable_distance_cache(DEFAULT_DISTANCE_CACHE_SIZE if distance_cache is True else distance_cache)
+    return instance
+
+def parse_explicit_tsp_file(file_path: str, storage: str = "condensed", dtype: str = "float64",
+                            cache: bool = False, cache_dir: str = None) -> TSPInstance:
+    """
+    EDGE_WEIGHT_TYPE: EXPLICIT 인스턴스를 파싱 (좌표 없이 거리 행렬만 사용)
+    
+    Args:
+        file_path: TSP 파일 경로
+        storage: "condensed", "dense", "memmap" 중 하나
+        dtype: 거리 값 형식 ("float64", "float32", "int32")
+        cache: True이면 파싱한 행렬을 바이너리 캐시에 저장하고 다음에는 메모리 매핑으로 읽음
+        cache_dir: 캐시 디렉토리 (None이면 원본 옆 .tsp_cache)
+        
+    Returns:
+        TSPInstance: 좌표 없이 거리 행렬을 가진 TSP 인스턴스
+    """
+    if storage == "memmap":
+        cache = True
+    
+    header = read_tsp_header(file_path)
+    name = header.get("NAME", "")
+    dimension = int(header["DIMENSION"])
+    edge_weight_format = header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX")
+    matrix_key = matrix_cache_key("dense" if storage == "dense" else "condensed", dtype)
+    
+    cached = load_cache(file_path, matrix_key, cache_dir) if cache else None
+    if cached is not None and cached[2] is not None:
+        _, display_coords, values = cached
+        matrix = values if storage == "dense" else CondensedDistanceMatrix(values, dimension)
+    else:
+        out = None
+        meta = {"name": name, "dimension": dimension, "edge_weight_type": "EXPLICIT"}
+        if storage == "memmap":
+            # 디스크 파일에 바로 기록 (메타데이터를 먼저 저장해야 행렬 파일이 지워지지 않음)
+            save_cache(file_path, meta, np.empty((0, 2)), cache_dir)
+            path = matrix_cache_path(file_path, matrix_key, cache_dir)
+            out = np.lib.format.open_memmap(f"{path}.{os.getpid()}.tmp", mode="w+",
+                                            dtype=distance_dtype(dtype), shape=(condensed_size(dimension),))
+        
+        builder = ExplicitMatrixBuilder(dimension, edge_weight_format, storage, dtype, out)
+        display_coords = read_explicit_sections(file_path, builder)
+        matrix = builder.finish()
+        
+        if storage == "memmap":
+            out.flush()
+            del out, builder
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+            matrix = open_memmap_matrix(path, dimension)
+        elif cache:
+            values = matrix if storage == "dense" else matrix.values
+            save_cache(file_path, meta, display_coords if display_coords is not None else np.empty((0, 2)), cache_dir)
+            save_matrix_cache(file_path, matrix_key, values, cache_dir)
+    
+    instance = TSPInstance(name, None, matrix, dimension, False, "EXPLICIT")
+    if display_coords is not None and len(display_coords) == dimension:
+        instance.display_coords = np.asarray(display_coords)
+    instance.source_path = file_path
+    return instance
+
+def read_tsp_header(file_path: str) -> Dict[str, str]:
+    """
+    첫 번째 섹션 이전의 "KEY : VALUE" 헤더를 딕셔너리로 읽음
+    
+    Args:
+        file_path: TSP 파일 경로
+        
+    Returns:
+        Dict[str, str]: 헤더 키 → 값 ("NAME : x", "NAME: x" 형식 모두 지원)
+    """
+    header = {}
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if ":" not in line:
+                # NODE_COORD_SECTION, EDGE_WEIGHT_SECTION, EOF 등
+                break
+            key, value = line.split(":", 1)
+            header[key.strip()] = value.strip()
+    return header
+
+def read_explicit_sections(file_path: str, builder: ExplicitMatrixBuilder) -> Optional[np.ndarray]:
+    """
+    EDGE_WEIGHT_SECTION을 일정 크기씩 변환해 builder에 넣고, DISPLAY_DATA_SECTION이 있으면 좌표로 읽음
+    
+    Args:
+        file_path: TSP 파일 경로
+        builder: 거리 값을 받을 ExplicitMatrixBuilder
+        
+    Returns:
+        Optional[np.ndarray]: 표시용 (n, 2) 좌표 (없으면 None)
+    """
+    display_coords = None
+    
+    with open(file_path, 'r') as file:
+        lines = iter(file)
+        line = next(lines, None)
+        while line is not None:
+            keyword = line.strip()
+            if keyword == "EDGE_WEIGHT_SECTION":
+                line = _stream_numeric_lines(lines, lambda text: builder.feed(_parse_numbers(text)))
+                continue
+            if keyword in ("DISPLAY_DATA_SECTION", "NODE_COORD_SECTION"):
+                blocks = []
+                line = _stream_numeric_lines(lines, blocks.append)
+                display_coords = parse_coordinate_block("".join(blocks), builder.dimension)
+                continue
+            if keyword == "EOF":
+                break
+            line = next(lines, None)
+    
+    return display_coords
+
+def _stream_numeric_lines(lines, consume) -> Optional[str]:
+    """
+    숫자 줄들을 EXPLICIT_BATCH_CHARS 크기 단위로 묶어 consume에 전달
+    
+    Returns:
+        Optional[str]: 구역을 끝낸 키워드 줄 (파일 끝이면 None)
+    """
+    batch = []
+    batch_chars = 0
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped and stripped[0].isalpha():
+            if batch:
+                consume("".join(batch))
+            return line
+        batch.append(line)
+        batch_chars += len(line)
+        if batch_chars >= EXPLICIT_BATCH_CHARS:
+            consume("".join(batch))
+            batch = []
+            batch_chars = 0
+    if batch:
+        consume("".join(batch))
+    return None
+
+def _parse_numbers(text: str) -> np.ndarray:
+    """공백으로 구분된 숫자 텍스트를 float64 배열로 변환"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        numbers = np.fromstring(text, sep=" ")
+    if numbers.size != len(text.split()):
+        raise ValueError("Non-numeric value in EDGE_WEIGHT_SECTION")
+    return numbers
+
+def matrix_cache_key(storage: str, dtype: str, tsplib_rounding: bool = False) -> str:
+    """거리 행렬 캐시 파일을 구분하는 키 (저장 방식, 값 형식, 반올림 여부)"""
+    return f"{storage}-{dtype}-nint" if tsplib_rounding else f"{storage}-{dtype}"
+
+def read_tsp_file(file_path: str, bulk: bool = True) -> Tuple[str, str, np.ndarray]:
+    """
+    TSP 파일의 헤더와 NODE_COORD_SECTION을 읽음
+    
+    Args:
+        file_path: TSP 파일 경로
+        bulk: True이면 좌표 구역을 한 번에 읽어 벡터화 변환 (False면 줄 단위 파싱)
+        
+    Returns:
+        Tuple[str, str, np.ndarray]: (이름, EDGE_WEIGHT_TYPE, (n, 2) 좌표 배열)
+    """
     coordinates = []
     name = ""
     dimension = 0
@@ -55,6 +514,10 @@ def parse_tsp_file(file_path: str) -> TSPInstance:
             elif line.startswith("EDGE_WEIGHT_TYPE"):
                 edge_weight_type = line.split(":")[1].strip()
             elif line == "NODE_COORD_SECTION":
+                if bulk:
+                    # 헤더 이후 나머지를 한 번에 읽어 변환
+                    coordinates = parse_coordinate_block(file.read(), dimension)
+                    break
                 reading_coordinates = True
                 continue
             elif line in ["EOF", "DISPLAY_DATA_SECTION", "EDGE_WEIGHT_SECTION"]:
@@ -66,26 +529,75 @@ def parse_tsp_file(file_path: str) -> TSPInstance:
                     x, y = float(parts[1]), float(parts[2])
                     coordinates.append((x, y))
     
-    if not coordinates:
+    if len(coordinates) == 0:
         raise ValueError(f"Coordinates not found in file: {file_path}")
     
-    # 큰 인스턴스 판별 (50,000개 도시 이상)
-    is_large = len(coordinates) >= 50000
+    return name, edge_weight_type, np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+
+def parse_coordinate_block(text: str, dimension: int = 0) -> np.ndarray:
+    """
+    NODE_COORD_SECTION 본문("인덱스 x y" 줄들)을 (n, 2) 좌표 배열로 변환
     
-    if is_large:
-        print(f"  ⚠️  대용량 인스턴스 감지 (n={len(coordinates)}): 거리 행렬 실시간 계산 모드")
-        # 빈 거리 행렬 (메모리 절약)
-        distance_matrix = []
-    else:
-        # 거리 행렬 계산
-        distance_matrix = calculate_distance_matrix(coordinates, edge_weight_type)
+    구역을 끝내는 키워드(EOF 등) 앞까지를 np.fromstring으로 한 번에 읽고,
+    열 개수가 고르지 않은 경우에만 줄 단위 파싱으로 되돌아간다.
+    줄 수가 DIMENSION과 다르거나 인덱스, x, y가 모두 있지 않은 줄이 있으면
+    ValueError를 낸다.
     
-    return TSPInstance(name, coordinates, distance_matrix, len(coordinates), is_large)
+    Args:
+        text: NODE_COORD_SECTION 다음부터의 파일 내용
+        dimension: 헤더의 DIMENSION 값 (0이면 줄 수로 판단)
+        
+    Returns:
+        np.ndarray: (n, 2) float64 좌표 배열
+    """
+    section_end = _COORD_SECTION_END.search(text)
+    if section_end:
+        text = text[:section_end.start()]
+    
+    with warnings.catch_warnings():
+        # 숫자가 아닌 토큰이 있으면 경고와 함께 일부만 읽으므로 아래에서 크기로 확인
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(text, sep=" ")
+    
+    # 줄 수가 DIMENSION과 같고 모든 줄에 인덱스, x, y가 있어야 함 (잘리거나 덧붙은 구역 검출)
+    counts = _line_token_counts(text)
+    if counts.size and counts.min() < 3:
+        row = int(np.argmax(counts < 3))
+        raise ValueError(f"NODE_COORD_SECTION row {row + 1} has {counts[row]} columns, expected index x y")
+    if dimension and counts.size != dimension:
+        raise ValueError(f"NODE_COORD_SECTION has {counts.size} rows, DIMENSION is {dimension}")
+    
+    if counts.size and counts.min() == counts.max() and values.size == counts.sum():
+        # 인덱스, x, y (뒤에 추가 열이 있으면 무시)
+        return values.reshape(counts.size, -1)[:, 1:3].copy()
+    
+    # 열 수가 줄마다 다르거나 숫자가 아닌 토큰이 있으면 줄 단위로 변환 (잘못된 값은 ValueError)
+    coordinates = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 3:
+            coordinates.append((float(parts[1]), float(parts[2])))
+    return np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+
+def _line_token_counts(text: str) -> np.ndarray:
+    """비어 있지 않은 줄마다 공백으로 구분된 토큰 수 (바이트 배열로 벡터화해 계산)"""
+    data = np.frombuffer(text.encode(), dtype=np.uint8)
+    if not data.size:
+        return np.zeros(0, dtype=np.int64)
+    space = (data == 32) | (data == 9) | (data == 13) | (data == 10) | (data == 11) | (data == 12)
+    token_start = ~space
+    token_start[1:] &= space[:-1]
+    line_of = np.cumsum(data == 10)
+    counts = np.bincount(line_of[token_start], minlength=line_of[-1] + 1)
+    return counts[counts > 0]
 
 def calculate_distance_matrix(coordinates: List[Tuple[float, float]], 
                             edge_weight_type: str = "EUC_2D"):
     """
-    좌표로부터 거리 행렬을 계산 (순수 Python 리스트 사용)
+    좌표로부터 거리 행렬을 계산 (리스트 API 호환용)
+    
+    내부적으로 build_distance_matrix의 블록 단위 벡터화 계산을 사용하며,
+    euclidean_distance/manhattan_distance로 한 쌍씩 계산한 값과 비트 단위로 같다.
     
     Args:
         coordinates: (x, y) 좌표 리스트
@@ -94,29 +606,17 @@ def calculate_distance_matrix(coordinates: List[Tuple[float, float]],
     Returns:
         List[List[float]]: 거리 행렬
     """
-    n = len(coordinates)
-    distance_matrix = [[0.0 for _ in range(n)] for _ in range(n)]
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            if edge_weight_type == "EUC_2D":
-                dist = euclidean_distance(coordinates[i], coordinates[j])
-            elif edge_weight_type == "MAN_2D":
-                dist = manhattan_distance(coordinates[i], coordinates[j])
-            else:
-                # 기본적으로 유클리드 거리 사용
-                dist = euclidean_distance(coordinates[i], coordinates[j])
-            
-            distance_matrix[i][j] = dist
-            distance_matrix[j][i] = dist
-    
-    return distance_matrix
+    coords = np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+    return build_distance_matrix(coords, edge_weight_type).tolist()
 
 def euclidean_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
     """유클리드 거리 계산"""
     x1, y1 = coord1
     x2, y2 = coord2
-    return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+    # ** 2는 libm pow를 거쳐 마지막 비트가 어긋날 수 있으므로 곱셈 사용 (벡터 계산과 동일)
+    dx = x1 - x2
+    dy = y1 - y2
+    return math.sqrt(dx * dx + dy * dy)
 
 def manhattan_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
     """맨하탄 거리 계산"""
@@ -124,46 +624,171 @@ def manhattan_distance(coord1: Tuple[float, float], coord2: Tuple[float, float])
     x2, y2 = coord2
     return abs(x1 - x2) + abs(y1 - y2)
 
-def load_tsp_instances(dataset_dir: str = "dataset") -> Dict[str, TSPInstance]:
+class LazyInstanceMap(Mapping):
     """
-    모든 필수 데이터셋을 로드
+    데이터셋 이름 → TSPInstance 매핑 (처음 접근할 때 파싱)
     
-    Args:
-        dataset_dir: 데이터셋 디렉토리 경로
-        
-    Returns:
-        Dict[str, TSPInstance]: 데이터셋 이름을 키로 하는 TSP 인스턴스 딕셔너리
+    실제로 꺼내 쓰는 인스턴스만 메모리에 올라간다. 파싱에 실패한 파일은
+    기존 로더처럼 로그를 남기고 키 목록에서 빠지며(KeyError), `in` 검사도
+    같은 결과를 주도록 처음 검사할 때 파싱을 시도한다.
     """
-    import os
-    
-    required_datasets = [
-        "test15.tsp",
-        "a280.tsp",
-        "xql662.tsp", 
-        "kz9976.tsp",
-        "mona-lisa100K.tsp"
-    ]
     
-    instances = {}
+    def __init__(self, dataset_paths: Dict[str, str], **parse_options):
+        self.dataset_paths = dict(dataset_paths)
+        self.parse_options = parse_options
+        self._instances = {}
     
-    for dataset_file in required_datasets:
-        file_path = os.path.join(dataset_dir, dataset_file)
-        if os.path.exists(file_path):
-            print(f"Loading {dataset_file}...")
+    def __getitem__(self, name: str) -> TSPInstance:
+        if name not in self._instances:
+            if name not in self.dataset_paths:
+                raise KeyError(name)
+            file_path = self.dataset_paths[name]
+            print(f"Loading {os.path.basename(file_path)}...")
             try:
-                instance = parse_tsp_file(file_path)
-                instances[dataset_file.replace('.tsp', '')] = instance
-                print(f"✅ {dataset_file} 로드 완료: {instance.dimension}개 도시")
+                instance = parse_tsp_file(file_path, **self.parse_options)
             except Exception as e:
-                print(f"❌ {dataset_file} 로드 실패: {e}")
+                self._drop(name, e)
+                raise KeyError(name) from e
+            self._store(name, instance)
+        return self._instances[name]
+    
+    def __contains__(self, name) -> bool:
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self):
+        # 순회 중 실패한 파일이 키 목록에서 빠질 수 있으므로 사본을 순회
+        return (name for name in list(self.dataset_paths) if name in self.dataset_paths)
+    
+    def __len__(self) -> int:
+        return len(self.dataset_paths)
+    
+    def items(self) -> List[Tuple[str, TSPInstance]]:
+        """로드에 성공한 (이름, 인스턴스) 목록 (필요한 파일을 파싱하고 실패한 파일은 건너뜀)"""
+        return [(name, self[name]) for name in self if name in self]
+    
+    def values(self) -> List[TSPInstance]:
+        """로드에 성공한 인스턴스 목록"""
+        return [instance for _, instance in self.items()]
+    
+    def is_loaded(self, name: str) -> bool:
+        """이미 파싱된 인스턴스인지 여부"""
+        return name in self._instances
+    
+    def preload(self, names: List[str] = None, workers: int = None) -> Dict[str, TSPInstance]:
+        """
+        여러 인스턴스를 미리 로드 (workers > 1이면 프로세스 풀에서 동시에 파싱)
+        
+        Args:
+            names: 로드할 데이터셋 이름 목록 (None이면 전체)
+            workers: 프로세스 수 (None 또는 1이면 순차 로드)
+            
+        Returns:
+            Dict[str, TSPInstance]: 로드에 성공한 인스턴스들
+        """
+        if names is None:
+            names = list(self.dataset_paths)
+        pending = [name for name in names if name not in self._instances]
+        
+        if workers and workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                futures = {name: executor.submit(_parse_in_worker, self.dataset_paths[name], self.parse_options)
+                           for name in pending}
+                for name, future in futures.items():
+                    try:
+                        instance = future.result()
+                        if instance is None:
+                            # 작업 프로세스가 만든 캐시를 메모리 매핑으로 읽음
+                            instance = parse_tsp_file(self.dataset_paths[name], **self.parse_options)
+                        self._store(name, instance)
+                    except Exception as e:
+                        self._drop(name, e)
         else:
-            print(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+            for name in pending:
+                try:
+                    self[name]
+                except KeyError:
+                    pass
+        
+        return {name: self._instances[name] for name in names if name in self._instances}
+    
+    def _drop(self, name: str, error: Exception):
+        print(f"❌ {os.path.basename(self.dataset_paths[name])} 로드 실패: {error}")
+        del self.dataset_paths[name]
+    
+    def _store(self, name: str, instance: TSPInstance):
+        self._instances[name] = instance
+        print(f"✅ {os.path.basename(self.dataset_paths[name])} 로드 완료: {instance.dimension}개 도시")
+
+def _parse_in_worker(file_path: str, parse_options: Dict[str, Any]) -> Optional[TSPInstance]:
+    """
+    프로세스 풀 작업 함수
+    
+    캐시를 쓰는 경우 거리 행렬까지 캐시에 기록하고 None을 반환한다.
+    큰 배열을 프로세스 간에 피클링하지 않고 부모 프로세스가 메모리 매핑으로 읽게 하기 위함이다.
+    """
+    if parse_options.get("cache") or parse_options.get("storage") == "memmap":
+        parse_tsp_file(file_path, **dict(parse_options, cache_matrix=True))
+        return None
+    return parse_tsp_file(file_path, **parse_options)
+
+def find_tsp_files(dataset_dir: str = "dataset", pattern: str = "*.tsp") -> Dict[str, str]:
+    """
+    데이터셋 디렉토리에서 glob 패턴에 맞는 TSP 파일 찾기
     
-    return instances
+    Args:
+        dataset_dir: 데이터셋 디렉토리 경로
+        pattern: 파일 이름 glob 패턴
+        
+    Returns:
+        Dict[str, str]: 데이터셋 이름(확장자 제외) → 파일 경로 (파일 크기 오름차순)
+    """
+    file_paths = [path for path in glob.glob(os.path.join(dataset_dir, pattern)) if os.path.isfile(path)]
+    file_paths.sort(key=lambda path: (os.path.getsize(path), path))
+    return {os.path.splitext(os.path.basename(path))[0]: path for path in file_paths}
+
+def load_tsp_instances(dataset_dir: str = "dataset", pattern: str = "*.tsp",
+                       lazy: bool = True, workers: int = None,
+                       cache: bool = False, cache_matrix: bool = False,
+                       **parse_options) -> Mapping[str, TSPInstance]:
+    """
+    데이터셋 디렉토리의 TSP 인스턴스를 로드
+    
+    Args:
+        dataset_dir: 데이터셋 디렉토리 경로
+        pattern: 로드할 파일의 glob 패턴 (기본: 모든 .tsp 파일)
+        lazy: True이면 처음 접근할 때 파싱하는 매핑을 반환
+        workers: lazy=False일 때 동시에 파싱할 프로세스 수
+        cache: True이면 바이너리 캐시 사용 (두 번째 실행부터 텍스트 파싱 생략,
+            데이터셋 디렉토리 안에 .tsp_cache를 만들므로 기본은 사용 안 함,
+            다른 위치에 두려면 cache_dir 지정)
+        cache_matrix: 거리 행렬도 캐시에 저장할지 여부
+        **parse_options: parse_tsp_file에 전달할 추가 옵션 (storage, dtype 등)
+        
+    Returns:
+        Mapping[str, TSPInstance]: 데이터셋 이름을 키로 하는 TSP 인스턴스 매핑
+    """
+    dataset_paths = find_tsp_files(dataset_dir, pattern)
+    if not dataset_paths:
+        print(f"❌ 파일을 찾을 수 없습니다: {os.path.join(dataset_dir, pattern)}")
+    
+    instances = LazyInstanceMap(dataset_paths, cache=cache, cache_matrix=cache_matrix, **parse_options)
+    if lazy:
+        return instances
+    return instances.preload(workers=workers)
 
 if __name__ == "__main__":
     # 테스트 코드
-    instances = load_tsp_instances()
+    instances = load_tsp_instances(lazy=False)
     for name, instance in instances.items():
-        matrix_info = f"{len(instance.distance_matrix)}x{len(instance.distance_matrix[0])}" if instance.distance_matrix else "실시간 계산"
+        if instance.storage == "condensed":
+            kind = "memmap" if isinstance(instance.matrix.values, np.memmap) else "condensed"
+            matrix_info = f"{kind} {len(instance.matrix.values)}"
+        elif instance.storage == "dense":
+            matrix_info = "x".join(map(str, instance.matrix.shape))
+        else:
+            matrix_info = "실시간 계산"
         print(f"{name}: {instance.dimension}개 도시, 거리 행렬: {matrix_info}") 
\ No newline at end of file
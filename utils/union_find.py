@@ -0,0 +1,54 @@
+"""
+Union-Find (Disjoint Set)
+배열 기반 서로소 집합 (경로 반감 + 랭크 기준 합치기, 재귀 없음)
+"""
+
+from typing import List
+
+class UnionFind:
+    """
+    0..n-1 원소의 서로소 집합
+
+    find는 경로 반감(path halving)으로 반복문만 사용하므로
+    10만 개 이상 원소에서도 재귀 한도에 걸리지 않는다.
+    """
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.components = n
+
+    def find(self, item: int) -> int:
+        """대표 원소 반환"""
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        두 원소의 집합을 합침
+
+        Returns:
+            bool: 서로 다른 집합이었으면 True
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        rank = self.rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+        self.components -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        """두 원소가 같은 집합인지 확인"""
+        return self.find(a) == self.find(b)
+
+    def labels(self) -> List[int]:
+        """원소별 대표 원소 목록"""
+        return [self.find(item) for item in range(len(self.parent))]